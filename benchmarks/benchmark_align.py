@@ -0,0 +1,134 @@
+"""Benchmarks of the alignment procedure"""
+import numpy as np
+
+import msalign
+from msalign.align import METHODS
+from msalign.kernels import NUMBA_AVAILABLE
+
+
+def make_data(n_signals: int, n_points: int, n_peaks: int = 4, seed: int = 0):
+    """Make signals with gaussian peaks that are randomly shifted and rescaled."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1000, n_points)
+    peaks = np.linspace(100, 900, n_peaks)
+    shifts = rng.uniform(-20, 20, n_signals)
+    scales = rng.uniform(0.99, 1.01, n_signals)
+    array = rng.normal(0, 0.01, (n_signals, n_points))
+    for i in range(n_signals):
+        for peak in peaks:
+            array[i] += np.exp(-np.square((x - (peak * scales[i] + shifts[i])) / 5))
+    return x, array, list(peaks)
+
+
+class TimeAligner:
+    """Benchmark computing and applying the correction factors for different interpolation methods."""
+
+    params = [METHODS, [10, 100], [1_000, 10_000]]
+    param_names = ["method", "n_signals", "n_points"]
+    timeout = 600
+
+    def setup(self, method, n_signals, n_points):
+        self.x, self.array, self.peaks = make_data(n_signals, n_points)
+        self.aligner = msalign.Aligner(self.x, self.array, self.peaks, method=method, width=5)
+        # correction factors that are applied in `align` are set to random (but realistic) values
+        rng = np.random.default_rng(0)
+        self.aligner.shift_opt[:, 0] = rng.uniform(-20, 20, n_signals)
+        self.aligner.scale_opt[:, 0] = rng.uniform(0.99, 1.01, n_signals)
+
+    def time_compute(self, method, n_signals, n_points):
+        self.aligner.compute(self.array[0])
+
+    def time_run(self, method, n_signals, n_points):
+        self.aligner.run()
+
+    def time_align(self, method, n_signals, n_points):
+        self.aligner.align()
+
+    def peakmem_run(self, method, n_signals, n_points):
+        self.aligner.run()
+
+
+class TimeShift:
+    """Benchmark shifting signals without rescaling."""
+
+    params = [[10, 100, 1_000], [1_000, 10_000]]
+    param_names = ["n_signals", "n_points"]
+
+    def setup(self, n_signals, n_points):
+        x, array, peaks = make_data(n_signals, n_points)
+        self.aligner = msalign.Aligner(x, array, peaks, width=5, only_shift=True, align_by_index=True)
+        self.aligner.run()
+
+    def time_shift(self, n_signals, n_points):
+        self.aligner.shift()
+
+
+class TimeGridSearch:
+    """Benchmark the grid search for different number of peaks, grid steps and iterations."""
+
+    params = [METHODS, [1, 4], [10, 20, 40], [3, 5, 10]]
+    param_names = ["method", "n_peaks", "grid_steps", "iterations"]
+    timeout = 600
+
+    def setup(self, method, n_peaks, grid_steps, iterations):
+        x, array, peaks = make_data(10, 5_000, n_peaks)
+        self.aligner = msalign.Aligner(
+            x, array, peaks, method=method, width=5, grid_steps=grid_steps, iterations=iterations
+        )
+
+    def time_run(self, method, n_peaks, grid_steps, iterations):
+        self.aligner.run()
+
+
+class TimeKernel:
+    """Benchmark the sparse operators vs the compiled kernel used by the grid search with linear interpolation."""
+
+    params = [["sparse", "numba"], [10, 100]]
+    param_names = ["kernel", "n_signals"]
+    timeout = 600
+
+    def setup(self, kernel, n_signals):
+        if kernel == "numba" and not NUMBA_AVAILABLE:
+            raise NotImplementedError("numba is not installed")
+        x, array, peaks = make_data(n_signals, 10_000)
+        self.aligner = msalign.Aligner(x, array, peaks, method="linear", width=5, kernel=kernel)
+        # compile the kernel before timing
+        self.aligner.compute(array[0])
+
+    def time_run(self, kernel, n_signals):
+        self.aligner.run()
+
+
+class TimeParallel:
+    """Benchmark single-thread vs parallel computation of the correction factors."""
+
+    params = [["linear", "cubic"], ["thread", "process"], [1, 2, 4]]
+    param_names = ["method", "backend", "n_jobs"]
+    timeout = 600
+
+    def setup(self, method, backend, n_jobs):
+        x, array, peaks = make_data(100, 5_000)
+        self.aligner = msalign.Aligner(x, array, peaks, method=method, width=5, n_jobs=n_jobs, backend=backend)
+        self.aligner.run()
+
+    def time_run(self, method, backend, n_jobs):
+        self.aligner.run()
+
+    def time_align(self, method, backend, n_jobs):
+        self.aligner.align()
+
+
+class TimeMSalign:
+    """Benchmark the top-level `msalign` function."""
+
+    params = [METHODS, [False, True]]
+    param_names = ["method", "only_shift"]
+    timeout = 600
+
+    def setup(self, method, only_shift):
+        self.x, self.array, self.peaks = make_data(50, 5_000)
+
+    def time_msalign(self, method, only_shift):
+        msalign.msalign(
+            self.x, self.array, self.peaks, method=method, width=5, only_shift=only_shift, align_by_index=only_shift
+        )
@@ -0,0 +1,18 @@
+"""Benchmarks of the import time"""
+
+
+def timeraw_import_msalign():
+    """Time importing the package in a fresh interpreter."""
+    return "import msalign"
+
+
+def timeraw_first_alignment():
+    """Time importing the package and aligning signals in shift-only mode (including the lazy imports)."""
+    return """
+    import numpy as np
+    import msalign
+
+    x = np.arange(1_000)
+    array = np.exp(-np.square((x - np.arange(480, 520)[:, None]) / 5))
+    msalign.msalign(x, array, [500], method="linear", only_shift=True, align_by_index=True)
+    """
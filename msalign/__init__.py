@@ -8,8 +8,10 @@ try:
 except ImportError:
     __version__ = "unknown"
 from .align import Aligner
+from .estimator import AlignmentEstimator
+from .plan import AlignmentPlan
 
-__all__ = ["msalign", "Aligner"]
+__all__ = ["msalign", "Aligner", "AlignmentEstimator", "AlignmentPlan"]
 
 
 def msalign(
@@ -27,6 +29,20 @@ def msalign(
     return_shifts: bool = False,
     align_by_index: bool = False,
     only_shift: bool = False,
+    memory_limit: int = None,
+    n_jobs: int = None,
+    backend: str = "process",
+    out: np.ndarray = None,
+    memory_mode: str = None,
+    optimizer: str = "grid",
+    xtol: float = None,
+    stol: float = None,
+    gain_tol: float = None,
+    proxy: str = None,
+    pyramid_levels: int = 0,
+    compute_dtype: str = None,
+    output_dtype: str = None,
+    kernel: str = "auto",
 ):
     aligner = Aligner(
         x,
@@ -43,6 +59,20 @@ def msalign(
         return_shifts=return_shifts,
         align_by_index=align_by_index,
         only_shift=only_shift,
+        memory_limit=memory_limit,
+        n_jobs=n_jobs,
+        backend=backend,
+        out=out,
+        memory_mode=memory_mode,
+        optimizer=optimizer,
+        xtol=xtol,
+        stol=stol,
+        gain_tol=gain_tol,
+        proxy=proxy,
+        pyramid_levels=pyramid_levels,
+        compute_dtype=compute_dtype,
+        output_dtype=output_dtype,
+        kernel=kernel,
     )
     aligner.run()
     return aligner.apply()
@@ -1,14 +1,50 @@
 """Main alignment class"""
+import copy
 import logging
+import math
 import time
 import typing as ty
 import warnings
 
 import numpy as np
 
-from .utilities import check_xy, convert_peak_values_to_index, generate_function, shift, time_loop
+from .kernels import KERNELS, NUMBA_AVAILABLE, score_linear
+from .optimize import OPTIMIZER_FUNCS
+from .parallel import BACKENDS, align_parallel, compute_parallel, get_n_jobs, shift_parallel
+from .plan import AlignmentPlan, get_plan
+from .utilities import (
+    LRUCache,
+    Progress,
+    ProgressTracker,
+    Workspace,
+    bin_signal,
+    check_xy,
+    convert_peak_values_to_index,
+    cross_correlate,
+    generate_function,
+    interpolation_operator,
+    shift,
+    shift_rows,
+    time_loop,
+)
 
 METHODS = ["pchip", "zero", "slinear", "quadratic", "cubic", "linear"]
+# approximate limit (in bytes) of the temporary arrays created when computing correction factors in batches
+MEMORY_LIMIT = 128 * 1024 * 1024
+MEMORY_MODES = ["copy", "compute", "inplace", "external"]
+OPTIMIZERS = ["grid", "fft", "nelder-mead", "brent", "pattern"]
+# floating point types that can be used to compute the correction factors and to interpolate the signals
+COMPUTE_DTYPES = ["float32", "float64"]
+# number of levels of the grid search that are skipped by warm-started signals and the relative drop of the objective
+# value (compared to the neighbouring signals) which causes the signal to be recomputed using the full search range
+WARM_START_LEVELS = 2
+WARM_START_TOL = 0.1
+# number of additional points on each side of the peak windows that are needed so that the interpolated values within
+# the windows are not affected by the edges. Splines are global so they need a lot more points (the effect of the
+# edges decays exponentially)
+SUPPORT_MARGIN = {"pchip": 3, "zero": 1, "slinear": 1, "quadratic": 32, "cubic": 32, "linear": 1}
+# minimum number of points that are required to create the interpolator
+MIN_POINTS = {"pchip": 2, "zero": 2, "slinear": 2, "quadratic": 3, "cubic": 4, "linear": 2}
 LOGGER = logging.getLogger(__name__)
 
 
@@ -17,7 +53,21 @@ class Aligner:
 
     _method, _gaussian_ratio, _gaussian_resolution, _gaussian_width, _n_iterations = None, None, None, None, None
     _corr_sig_l, _corr_sig_x, _corr_sig_y, _reduce_range_factor, _scale_range = None, None, None, None, None
-    _search_space, _computed = None, False
+    _search_space, _computed, _proxy, _proxy_sampling, _pyramid_sampling = None, False, None, None, None
+    _compute_dtype, _output_dtype = np.dtype(np.float64), None
+    # per-signal information about the optimization. The time of each phase is shared equally by the signals that
+    # are processed together
+    _info_fields = {
+        "n_evaluations": np.int64,
+        "n_iterations_used": np.int64,
+        "score": np.float64,
+        "n_points": np.int64,
+        "time_interpolators": np.float64,
+        "time_objective": np.float64,
+        "time_select": np.float64,
+        "time_refine": np.float64,
+        "time_signal": np.float64,
+    }
 
     def __init__(
         self,
@@ -35,6 +85,20 @@ class Aligner:
         return_shifts: bool = False,
         align_by_index: bool = False,
         only_shift: bool = False,
+        memory_limit: ty.Optional[int] = None,
+        n_jobs: ty.Optional[int] = None,
+        backend: str = "process",
+        out: ty.Optional[np.ndarray] = None,
+        memory_mode: ty.Optional[str] = None,
+        optimizer: str = "grid",
+        xtol: ty.Optional[float] = None,
+        stol: ty.Optional[float] = None,
+        gain_tol: ty.Optional[float] = None,
+        proxy: ty.Optional[str] = None,
+        pyramid_levels: int = 0,
+        compute_dtype: ty.Optional[str] = None,
+        output_dtype: ty.Optional[str] = None,
+        kernel: str = "auto",
     ):
         """Signal calibration and alignment by reference peaks
 
@@ -88,15 +152,82 @@ class Aligner:
             decide whether shift parameter `shift_opt` should also be returned. Default: False
         align_by_index : bool
             decide whether alignment should be done based on index rather than `xvals` array. Default: False
+        memory_limit : int (optional)
+            approximate amount of memory (in bytes) that can be used by the temporary arrays when computing
+            correction factors for multiple signals at once. Signals are processed in chunks that fit within this
+            limit (including the scratch buffers) and the search grid of each signal is interpolated in blocks of
+            cells using scratch buffers of at most this size that are reused by all iterations and signals.
+            Default: 128 MB
+        n_jobs : int (optional)
+            number of workers (processes or threads, see `backend`) used to compute and apply the correction
+            factors. With the 'process' backend, the input and output arrays are shared with the workers using shared
+            memory while threads access them directly. Negative values are counted from the number of available
+            cores, so '-1' uses all cores. Default: 1
+        backend : str (optional)
+            parallel backend used when `n_jobs` is above 1. Either 'process' or 'thread'. Threads avoid the cost of
+            starting processes and transferring data and work well as most of the work is done by NumPy/SciPy
+            which release the GIL. Default: 'process'
+        out : np.ndarray (optional)
+            2D array (M x N) where the aligned signals should be written, e.g. `np.memmap`. If not specified, new
+            array is created
+        memory_mode : str (optional)
+            determines where the aligned signals are written. Either 'copy' (new array is created), 'compute' (no
+            array is created and only the correction factors can be computed), 'inplace' (the input array is
+            overwritten one row at a time - it must be floating point unless only shifting) or 'external' (signals
+            are written to the `out` array). Default: 'external' if `out` is specified, otherwise 'copy'
+        optimizer : str (optional)
+            method used to find the optimal correction factors. Either 'grid' (iterative grid search) or 'fft'. The
+            'fft' optimizer can only be used when only shifting signals and it cross-correlates the synthetic signal
+            with each signal to find the best shift over the full `shift_range` in a single pass. The 'nelder-mead',
+            'brent' (coordinate-wise) and 'pattern' optimizers use a single level of the grid search to find the
+            starting point which is then refined by the derivative-free local optimizer to the same precision as the
+            full grid search. The number of objective evaluations is stored in `n_evaluations`. Default: 'grid'
+        xtol : float (optional)
+            the refinement of a signal is stopped once its shift changes by less than `xtol` between iterations.
+            Default: None
+        stol : float (optional)
+            the refinement of a signal is stopped once its scale changes by less than `stol` between iterations.
+            Default: None
+        gain_tol : float (optional)
+            the refinement of a signal is stopped once its objective value improves by less than `gain_tol` (relative
+            to the previous value) between iterations. When several tolerances are specified, all of them must be
+            satisfied. The number of iterations used for each signal is stored in `n_iterations_used`. Default: None
+        proxy : str (optional)
+            reduced representation of the signals that is used to compute the correction factors which are then
+            applied to the full-resolution signals. Either 'bin:k' (average of `k` consecutive points) or 'peaks'
+            (only the points around the reference peaks). Not supported by the 'fft' optimizer. Default: None
+        pyramid_levels : int (optional)
+            number of coarse levels of the signal pyramid. The first `pyramid_levels` iterations of the grid search
+            are performed on signals (and synthetic signal) downsampled by factor of 2^level, one iteration per level,
+            and only the remaining iterations use the full resolution. At least one iteration always uses the full
+            resolution. Levels whose bins would be wider than the peaks (`width`) are not used. Default: 0
+        compute_dtype : str (optional)
+            floating point type used to compute the correction factors and to interpolate the signals. Either
+            'float32' or 'float64'. Single precision halves the memory footprint (and bandwidth) of the temporary
+            arrays at the cost of slightly less precise objective values. Default: 'float64'
+        output_dtype : str (optional)
+            floating point type of the aligned signals when new array is created (e.g. 'float16' or 'float32'). In the
+            'inplace' and 'external' memory modes the aligned signals follow the type of the input and `out` arrays,
+            respectively. Default: type of the input array if it is floating point, otherwise 'float64'
+        kernel : str (optional)
+            implementation of the grid search objective for 'linear' interpolation. Either 'sparse' (sparse
+            interpolation operators), 'numba' (compiled kernel that interpolates and accumulates the score of each
+            grid point in a single pass, requires `numba`) or 'auto' ('numba' if it is installed). Both give the same
+            correction factors. Default: 'auto'
         """
         self.x = np.asarray(x)
         if array is not None:
-            self.array = check_xy(self.x, np.asarray(array))
+            # arrays (including `np.memmap`) are used as they are to avoid loading the data into memory
+            if not isinstance(array, np.ndarray):
+                array = np.asarray(array)
+            self.array = check_xy(self.x, array)
         else:
             self.array = np.empty((0, len(self.x)))
 
         self.n_signals = self.array.shape[0]
-        self.array_aligned = np.zeros_like(self.array)
+        self.compute_dtype = compute_dtype
+        self._output_dtype = self._check_output_dtype(output_dtype)
+        self.array_aligned = self._get_output(memory_mode, out)
         self.peaks = list(peaks)
 
         # set attributes
@@ -106,6 +237,12 @@ class Aligner:
         self.scale_opt = np.ones((self.n_signals, 1), dtype=np.float32)
         self.shift_opt = np.zeros((self.n_signals, 1), dtype=np.float32)
         self.shift_values = np.zeros_like(self.shift_opt)
+        self.n_evaluations = np.zeros(self.n_signals, dtype=np.int64)
+        self.n_iterations_used = np.zeros(self.n_signals, dtype=np.int64)
+        self._info, self._time_compute, self._time_apply = None, 0.0, 0.0
+        # progress of the last operation and flag used to cancel the operation in progress
+        self.progress: ty.Optional[Progress] = None
+        self._cancelled = False
 
         self.method = method
         self.gaussian_ratio = ratio
@@ -119,6 +256,12 @@ class Aligner:
         if weights is None:
             weights = np.ones(self.n_peaks)
         self.weights = weights
+        self.memory_limit = memory_limit
+        self.xtol = xtol
+        self.stol = stol
+        self.gain_tol = gain_tol
+        self.n_jobs = n_jobs
+        self.backend = backend
 
         # return shift vector
         self._return_shifts = return_shifts
@@ -128,6 +271,12 @@ class Aligner:
         if only_shift and not align_by_index:
             align_by_index = True
             LOGGER.warning("Only computing shifts - changed `align_by_index` to `True`.")
+        # shifting by whole number of points is lossless but interpolated values would be truncated
+        if self._memory_mode == "inplace" and not only_shift and not np.issubdtype(self.array.dtype, np.floating):
+            raise ValueError(
+                "Cannot align signals in-place when the input array is not floating point - use `only_shift=True` or"
+                " different memory mode."
+            )
 
         # align signals by index rather than peak value
         self._align_by_index = align_by_index
@@ -137,7 +286,13 @@ class Aligner:
             self.peaks = convert_peak_values_to_index(self.x, self.peaks)
             self.x = np.arange(self.x.shape[0])
             LOGGER.debug(f"Aligning by index - peak positions: {self.peaks}")
+        # the native linear interpolator can skip sorting of the separation units
+        self._x_sorted = bool(np.all(self.x[1:] >= self.x[:-1]))
         self._only_shift = only_shift
+        self.optimizer = optimizer
+        self.proxy = proxy
+        self.pyramid_levels = pyramid_levels
+        self.kernel = kernel
 
         self._initialize()
 
@@ -150,6 +305,8 @@ class Aligner:
     def method(self, value: str):
         if value not in METHODS:
             raise ValueError(f"Method `{value}` not found in the method options: {METHODS}")
+        if self._proxy is not None:
+            self._check_proxy(self._proxy, value)
         self._method = value
 
     @property
@@ -235,116 +392,1115 @@ class Aligner:
             raise ValueError("Number of weights does not match the number of peaks.")
         self._weights = np.asarray(value)
 
-    def _initialize(self):
-        """Prepare dataset for alignment"""
-        # check that values for gaussian_width are valid
-        gaussian_widths = np.zeros((self.n_peaks, 1))
-        for i in range(self.n_peaks):
-            gaussian_widths[i] = self.gaussian_width
-
-        # set the synthetic target signal
-        corr_sig_x = np.zeros((self.gaussian_resolution + 1, self.n_peaks))
-        corr_sig_y = np.zeros((self.gaussian_resolution + 1, self.n_peaks))
-
-        gaussian_resolution_range = np.arange(0, self.gaussian_resolution + 1)
-        for i in range(self.n_peaks):
-            left_l = self.peaks[i] - self.gaussian_ratio * gaussian_widths[i]  # noqa
-            right_l = self.peaks[i] + self.gaussian_ratio * gaussian_widths[i]  # noqa
-            corr_sig_x[:, i] = left_l + (gaussian_resolution_range * (right_l - left_l) / self.gaussian_resolution)
-            corr_sig_y[:, i] = self.weights[i] * np.exp(
-                -np.square((corr_sig_x[:, i] - self.peaks[i]) / gaussian_widths[i])  # noqa
+    @property
+    def memory_limit(self):
+        """Approximate memory limit (in bytes) of the temporary arrays used in batched computation."""
+        return self._memory_limit
+
+    @memory_limit.setter
+    def memory_limit(self, value: ty.Optional[int]):
+        if value is None:
+            value = MEMORY_LIMIT
+        if value <= 0:
+            raise ValueError("Value of 'memory_limit' must be above 0!")
+        self._memory_limit = int(value)
+
+    @property
+    def xtol(self) -> ty.Optional[float]:
+        """Tolerance of the shift value used to stop the refinement of a signal."""
+        return self._xtol
+
+    @xtol.setter
+    def xtol(self, value: ty.Optional[float]):
+        self._xtol = self._check_tolerance(value, "xtol")
+
+    @property
+    def stol(self) -> ty.Optional[float]:
+        """Tolerance of the scale value used to stop the refinement of a signal."""
+        return self._stol
+
+    @stol.setter
+    def stol(self, value: ty.Optional[float]):
+        self._stol = self._check_tolerance(value, "stol")
+
+    @property
+    def gain_tol(self) -> ty.Optional[float]:
+        """Tolerance of the relative improvement of the objective value used to stop the refinement of a signal."""
+        return self._gain_tol
+
+    @gain_tol.setter
+    def gain_tol(self, value: ty.Optional[float]):
+        self._gain_tol = self._check_tolerance(value, "gain_tol")
+
+    @staticmethod
+    def _check_tolerance(value: ty.Optional[float], name: str) -> ty.Optional[float]:
+        """Check that tolerance is either `None` or non-negative number"""
+        if value is None:
+            return None
+        if not isinstance(value, (int, float, np.number)) or value < 0:
+            raise ValueError(f"Value of '{name}' must be a non-negative number!")
+        return float(value)
+
+    @property
+    def n_jobs(self) -> int:
+        """Number of workers (processes or threads, see `backend`) used to compute and apply the correction factors."""
+        return self._n_jobs
+
+    @n_jobs.setter
+    def n_jobs(self, value: ty.Optional[int]):
+        self._n_jobs = get_n_jobs(value)
+
+    @property
+    def backend(self) -> str:
+        """Parallel backend."""
+        return self._backend
+
+    @backend.setter
+    def backend(self, value: str):
+        if value not in BACKENDS:
+            raise ValueError(f"Backend `{value}` not found in the backend options: {BACKENDS}")
+        self._backend = value
+
+    @property
+    def optimizer(self) -> str:
+        """Method used to find the optimal correction factors."""
+        return self._optimizer
+
+    @optimizer.setter
+    def optimizer(self, value: str):
+        if value not in OPTIMIZERS:
+            raise ValueError(f"Optimizer `{value}` not found in the optimizer options: {OPTIMIZERS}")
+        if value == "fft" and not self._only_shift:
+            raise ValueError("The 'fft' optimizer can only be used when `only_shift=True`.")
+        if value == "fft" and self._proxy is not None:
+            raise ValueError("The 'fft' optimizer does not support proxy signals.")
+        self._optimizer = value
+
+    @property
+    def proxy(self) -> ty.Optional[str]:
+        """Reduced representation of the signals used to compute the correction factors."""
+        if self._proxy is None:
+            return None
+        kind, factor = self._proxy
+        return f"bin:{factor}" if kind == "bin" else kind
+
+    @proxy.setter
+    def proxy(self, value: ty.Optional[str]):
+        proxy = None
+        if value is not None:
+            kind, _, factor = str(value).partition(":")
+            if kind == "peaks" and not factor:
+                proxy = ("peaks", None)
+            elif kind == "bin" and factor.isdigit() and int(factor) > 1:
+                proxy = ("bin", int(factor))
+            else:
+                raise ValueError(f"Proxy `{value}` is not valid - use either 'bin:k' (where k > 1) or 'peaks'.")
+            if self.optimizer == "fft":
+                raise ValueError("The 'fft' optimizer does not support proxy signals.")
+            self._check_proxy(proxy, self.method)
+        self._proxy = proxy
+        # the proxy depends on the support which is only available once the aligner is initialized
+        if self._search_space is not None:
+            self._update_sampling()
+
+    def _check_proxy(self, proxy: ty.Tuple, method: str):
+        """Check that the proxy signals have enough points to be interpolated with `method`."""
+        kind, factor = proxy
+        if kind != "bin":
+            return
+        n_points = -(-self.x.shape[0] // factor)
+        if n_points < MIN_POINTS[method]:
+            raise ValueError(
+                f"Proxy `bin:{factor}` reduces the signals to {n_points} point(s) but the '{method}' method requires at"
+                f" least {MIN_POINTS[method]} - use smaller `proxy` factor."
             )
 
-        self._corr_sig_l = (self.gaussian_resolution + 1) * self.n_peaks
-        self._corr_sig_x = corr_sig_x.flatten("F")
-        self._corr_sig_y = corr_sig_y.flatten("F")
+    @property
+    def pyramid_levels(self) -> int:
+        """Number of coarse levels of the signal pyramid."""
+        return self._pyramid_levels
+
+    @pyramid_levels.setter
+    def pyramid_levels(self, value: int):
+        if not isinstance(value, (int, np.integer)) or value < 0:
+            raise ValueError("Value of 'pyramid_levels' must be a non-negative integer!")
+        self._pyramid_levels = int(value)
+        if self._search_space is not None:
+            self._update_sampling()
+
+    @property
+    def kernel(self) -> str:
+        """Implementation of the grid search objective for linear interpolation."""
+        return self._kernel
+
+    @kernel.setter
+    def kernel(self, value: str):
+        if value not in KERNELS:
+            raise ValueError(f"Kernel `{value}` not found in the kernel options: {KERNELS}")
+        if value == "numba" and not NUMBA_AVAILABLE:
+            raise ImportError("The 'numba' kernel requires `numba` to be installed.")
+        self._kernel = value
+
+    @property
+    def _use_kernel(self) -> bool:
+        """Flag to indicate whether the compiled kernel is used to score the search grid."""
+        return NUMBA_AVAILABLE and self._kernel != "sparse" and self.method == "linear"
 
-        # set reduce_range_factor to take 5 points of the previous ranges or half of
-        # the previous range if grid_steps < 10
-        self._reduce_range_factor = min(0.5, 5 / self.grid_steps)
+    @property
+    def compute_dtype(self) -> np.dtype:
+        """Floating point type used to compute the correction factors and to interpolate the signals."""
+        return self._compute_dtype
 
-        # set scl such that the maximum peak can shift no more than the limits imposed by shift when scaling
-        self._scale_range = 1 + self.shift_range / max(self.peaks)
+    @compute_dtype.setter
+    def compute_dtype(self, value: ty.Optional[str]):
+        if value is None:
+            value = np.float64
+        try:
+            value = np.dtype(value)
+        except TypeError:
+            value = None
+        if value is None or value.name not in COMPUTE_DTYPES:
+            raise ValueError(f"Compute dtype must be one of the options: {COMPUTE_DTYPES}")
+        self._compute_dtype = value
 
-        if self._only_shift:
-            self._scale_range = np.array([1, 1])
+    @property
+    def output_dtype(self) -> np.dtype:
+        """Floating point type of the aligned signals."""
+        if self.array_aligned is not None:
+            return self.array_aligned.dtype
+        return self._get_output_dtype(self.array.dtype)
 
-        # create the mesh-grid only once
-        mesh_a, mesh_b = np.meshgrid(
-            np.divide(np.arange(0, self.grid_steps), self.grid_steps - 1),
-            np.divide(np.arange(0, self.grid_steps), self.grid_steps - 1),
+    @staticmethod
+    def _check_output_dtype(value: ty.Optional[str]) -> ty.Optional[np.dtype]:
+        """Check that the output type is either `None` or floating point type"""
+        if value is None:
+            return None
+        try:
+            value = np.dtype(value)
+        except TypeError:
+            value = None
+        if value is None or not np.issubdtype(value, np.floating):
+            raise ValueError("Output dtype must be a floating point type, e.g. 'float32'.")
+        return value
+
+    def _get_output_dtype(self, dtype: np.dtype) -> np.dtype:
+        """Get type of the aligned signals for input signals of the specified type."""
+        if self._output_dtype is not None:
+            return self._output_dtype
+        # integer signals would be silently truncated after interpolation
+        return dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
+
+    def _update_sampling(self):
+        """Update separation units (and related data) of the proxy signals and of the levels of the signal pyramid."""
+        self._proxy_sampling = self._get_proxy_sampling()
+        x = self.x if self._proxy_sampling is None else self._proxy_sampling[0]
+        self._pyramid_sampling = {}
+        if not self.pyramid_levels:
+            return
+        # bins that are wider than the peaks would smooth them out, so such levels are not created
+        spacing = np.median(np.abs(np.diff(x))) if x.shape[0] > 1 else 0
+        for level in range(1, self.pyramid_levels + 1):
+            if 2**level * spacing > self.gaussian_width:
+                LOGGER.debug(f"Limited the signal pyramid to {level - 1} levels as the bins would exceed peak width")
+                break
+            x_level = bin_signal(x, 2**level)
+            x_sorted = bool(np.all(x_level[1:] >= x_level[:-1]))
+            self._pyramid_sampling[2**level] = (
+                x_level,
+                x_sorted,
+                self._get_support(x_level, x_sorted),
+                LRUCache(self._operators.maxsize),
+            )
+
+    def _get_sampling(self, factor: int = 1) -> ty.Tuple:
+        """Get separation units, support and operator cache of the signals downsampled by `factor`."""
+        if factor > 1:
+            return self._pyramid_sampling[factor]
+        if self._proxy_sampling is not None:
+            return self._proxy_sampling
+        return self.x, self._x_sorted, self._support, self._operators
+
+    def _get_proxy_sampling(self) -> ty.Optional[ty.Tuple]:
+        """Get separation units (and related data) of the proxy signals."""
+        if self._proxy is None:
+            return None
+        kind, factor = self._proxy
+        if kind == "peaks" and self._support is None:
+            return None
+        x = bin_signal(self.x, factor) if kind == "bin" else self.x[self._support]
+        x_sorted = bool(np.all(x[1:] >= x[:-1]))
+        return x, x_sorted, self._get_support(x, x_sorted), LRUCache(self._operators.maxsize)
+
+    def _reduce(self, array: np.ndarray) -> np.ndarray:
+        """Convert signals to the proxy representation."""
+        kind, factor = self._proxy
+        if kind == "bin":
+            return bin_signal(array, factor)
+        return array[:, self._support]
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of signals that are processed together in the batched computation."""
+        if self.optimizer == "fft":
+            # the padded signal and its spectrum (and a couple of temporary arrays) are created for each signal
+            n_bytes = 4 * (self.x.shape[0] + np.abs(self.shift_range).max()) * self.compute_dtype.itemsize
+            return max(1, int(self.memory_limit // n_bytes))
+        x, x_sorted, support, _ = self._get_sampling()
+        n_cells, itemsize = self.grid_steps**2, self.compute_dtype.itemsize
+        use_kernel = self._use_kernel and self.method == "linear" and x_sorted
+        # the interpolated grid of each signal is never created. The interpolators write blocks of it to the scratch
+        # buffers of the workspace which are shared by all signals, the compiled kernel accumulates the scores directly
+        # and the sparse operator of the first level produces the scores of all signals at once. Only the signal, the
+        # search grid and the scores (double precision) remain for each signal
+        n_bytes = x.shape[0] * itemsize + 3 * n_cells * 8
+        n_workspace = 0
+        if not use_kernel:
+            block_size = min(n_cells, self._get_block_size(self._corr_sig_l, self.compute_dtype))
+            n_workspace = block_size * self._corr_sig_l * (16 + itemsize)
+            if self.method != "linear":
+                # the signals that share the window of the first level are interpolated together (see `_score_shared`)
+                n_workspace += (self.memory_limit - n_workspace) // 2
+        if not use_kernel or self.optimizer != "grid":
+            # the interpolator of each signal keeps (up to) several arrays of the size of the support
+            n_bytes += 6 * (x.shape[0] if support is None else support.size) * 8
+        return max(1, (self.memory_limit - n_workspace) // n_bytes)
+
+    def _initialize(self):
+        """Prepare dataset for alignment"""
+        # the synthetic target signal and the search grid do not depend on the signals so they are shared by all
+        # aligners with the same parameters
+        self._plan = get_plan(
+            self.peaks,
+            self.weights,
+            self.gaussian_width,
+            self.gaussian_ratio,
+            self.gaussian_resolution,
+            self.grid_steps,
+            self.shift_range,
+            self._only_shift,
         )
-        self._search_space = np.tile(
-            np.vstack([mesh_a.flatten(order="F"), mesh_b.flatten(order="F")]).T, [1, self._n_iterations]
+        self._corr_sig_l, self._corr_sig_x, self._corr_sig_y = (
+            self._plan.corr_sig_l,
+            self._plan.corr_sig_x,
+            self._plan.corr_sig_y,
         )
+        self._reduce_range_factor, self._scale_range = self._plan.reduce_range_factor, self._plan.scale_range
+        self._search_space = self._plan.search_space
+
+        # linear interpolation of signals that share the same search grid (the first level of the grid search) can be
+        # expressed as sparse operator. These are cached as the grid only depends on the alignment parameters
+        n_bytes = 2 * self._search_space.shape[0] * self._corr_sig_l * (self.compute_dtype.itemsize + 4)
+        self._operators = LRUCache(max(1, self.memory_limit // n_bytes))
+        # scratch buffers used to evaluate the search grid (each thread has its own buffers)
+        self._workspace = Workspace()
+
+        # only the points around the reference peaks are sampled during the grid search
+        self._support = self._get_support()
+        self._update_sampling()
+
+    @property
+    def plan(self) -> AlignmentPlan:
+        """Alignment plan with the synthetic signal and the search grid."""
+        return self._plan
+
+    def _get_support(
+        self, x: ty.Optional[np.ndarray] = None, x_sorted: ty.Optional[bool] = None
+    ) -> ty.Optional[np.ndarray]:
+        """Get indices of the points in `x` that can be sampled during the grid search.
+
+        Returns `None` if all (or most) points are required.
+        """
+        if x is None:
+            x, x_sorted = self.x, self._x_sorted
+        if not x_sorted:
+            return None
+        left, right = self._plan.support_edges
+        n_points, margin = x.shape[0], SUPPORT_MARGIN[self.method]
+        mask = np.zeros(n_points, dtype=bool)
+        starts = np.searchsorted(x, left, side="left") - margin
+        stops = np.searchsorted(x, right, side="right") + margin
+        for start, stop in zip(starts, stops):
+            mask[max(0, start) : min(n_points, stop)] = True
+        # building interpolators over nearly the full signal would not speed things up
+        if mask.mean() > 0.5:
+            return None
+        return np.flatnonzero(mask)
+
+    def run(
+        self,
+        n_iterations: int = None,
+        warm_start: ty.Union[bool, int] = False,
+        callback: ty.Optional[ty.Callable[[Progress], ty.Optional[bool]]] = None,
+        callback_every: ty.Optional[int] = None,
+    ):
+        """Execute the alignment procedure for each signal in the 2D array and collate the shift/scale vectors
 
-    def run(self, n_iterations: int = None):
-        """Execute the alignment procedure for each signal in the 2D array and collate the shift/scale vectors"""
+        The operation can be cancelled by the `callback` or by calling `cancel` (e.g. from another thread). In that
+        case, only the correction factors of the first `progress.n_done` signals are updated.
+
+        Parameters
+        ----------
+        n_iterations : int (optional)
+            number of iterations of the grid search. Default: `n_iterations`
+        warm_start : bool or int (optional)
+            if specified, every `warm_start`-th signal (8th if `True`) is computed using the full search range and the
+            remaining signals start from the running median of the neighbouring solutions with a narrow search
+            window. Signals whose objective value drops (or whose solution lies at the edge of the narrow window)
+            are recomputed using the full search range. Useful for sequential scans where consecutive signals have
+            nearly identical shift and scale. Only supported by the 'grid' optimizer. Default: False
+        callback : Callable (optional)
+            function that is called with the `Progress` of the operation every `callback_every` signals. If it
+            returns `True`, the operation is cancelled
+        callback_every : int (optional)
+            number of signals between the calls of `callback`. Signals are computed in blocks of this size so small
+            values reduce the benefit of vectorization. Default: `chunk_size`
+        """
         self.n_iterations = n_iterations or self.n_iterations
+        warm_start = self._check_warm_start(warm_start)
+        progress = self._get_progress_tracker("run", callback, callback_every, self.chunk_size)
         # iterate for every signal
-        t_start = time.time()
+        t_start, t_counter = time.time(), time.perf_counter()
 
         # main loop: searches for the optimum values of Scale and Shift factors by search over a multi-resolution
         # grid, getting better at each iteration. Increasing the number of iterations improves the shift and scale
-        # parameters
-        for n_signal, y in enumerate(self.array):
-            self.shift_opt[n_signal], self.scale_opt[n_signal] = self.compute(y)
-        LOGGER.debug(f"Processed {self.n_signals} signals " + time_loop(t_start, self.n_signals + 1, self.n_signals))
-        self._computed = True
+        # parameters. Signals are processed in chunks so the grid search can be evaluated for many signals at once
+        if self.n_jobs > 1 and self.n_signals > 1:
+            shift_opt, scale_opt, info = compute_parallel(
+                self, self.array, self.n_jobs, self.backend, warm_start, progress
+            )
+        else:
+            shift_opt, scale_opt, info = self._compute_blocks(self.array, warm_start, progress)
+        n_done = progress.n_done
+        self.shift_opt[:n_done, 0], self.scale_opt[:n_done, 0] = shift_opt[:n_done], scale_opt[:n_done]
+        self.n_evaluations[:n_done] = info["n_evaluations"][:n_done]
+        self.n_iterations_used[:n_done] = info["n_iterations_used"][:n_done]
+        self._info = {key: values[:n_done] for key, values in info.items()}
+        self._time_compute = time.perf_counter() - t_counter
+        self.progress = progress.progress
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(f"Processed {n_done} signals " + time_loop(t_start, n_done + 1, n_done))
+        self._computed = n_done == self.n_signals
+
+    def _compute_blocks(
+        self, array: np.ndarray, warm_start: int, progress: ProgressTracker
+    ) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+        """Compute correction factors in consecutive blocks of signals and report the progress after each block"""
+        if warm_start:
+            # warm-started signals depend on their neighbours which are carried over between the blocks
+            return self._compute_warm_start(array, warm_start, progress.every, progress)
+        n_signals = array.shape[0]
+        shift_opt, scale_opt = np.zeros(n_signals), np.ones(n_signals)
+        info = {key: np.zeros(n_signals, dtype=dtype) for key, dtype in self._info_fields.items()}
+        for start in range(0, n_signals, progress.every):
+            stop = min(start + progress.every, n_signals)
+            shift_opt[start:stop], scale_opt[start:stop], block_info = self.compute_batch(
+                array[start:stop], return_info=True
+            )
+            for key, values in block_info.items():
+                info[key][start:stop] = values
+            if progress.update(stop):
+                break
+        return shift_opt, scale_opt, info
+
+    def cancel(self):
+        """Cancel the operation (`run`, `apply`, `align` or `shift`) that is in progress.
+
+        The operation is stopped once the current block of signals is processed - see `progress` for the number of
+        signals that were processed.
+        """
+        self._cancelled = True
+
+    def _get_progress_tracker(
+        self,
+        stage: str,
+        callback: ty.Optional[ty.Callable[[Progress], ty.Optional[bool]]],
+        every: ty.Optional[int],
+        default_every: int,
+    ) -> ProgressTracker:
+        """Create progress tracker of new operation."""
+        every = default_every if every is None else every
+        if not isinstance(every, (int, np.integer)) or every < 1:
+            raise ValueError("Value of 'callback_every' must be a positive integer!")
+        self._cancelled = False
+        return ProgressTracker(stage, self.n_signals, callback, int(every), lambda: self._cancelled)
+
+    @property
+    def stats(self) -> ty.Dict[str, float]:
+        """Counters and timings (in seconds) of the last `run` and of the last `apply` (`align` or `shift`).
+
+        Signals are processed together so the time of each phase of the computation is shared equally by the
+        signals in the same chunk. When using multiple workers, the times of the phases are summed over all workers
+        and can exceed the wall time of `run` (`time_compute`). For the same reason, `time_per_signal` is the
+        amortized (average) time of the computation of a signal rather than its latency.
+        """
+        info = self._info
+        if info is None:
+            info = {key: np.zeros(0, dtype=dtype) for key, dtype in self._info_fields.items()}
+        n_signals = info["time_signal"].size
+        return {
+            "n_signals": int(n_signals),
+            "n_evaluations": int(info["n_evaluations"].sum()),
+            "n_points": int(info["n_points"].sum()),
+            "time_interpolators": float(info["time_interpolators"].sum()),
+            "time_objective": float(info["time_objective"].sum()),
+            "time_select": float(info["time_select"].sum()),
+            "time_refine": float(info["time_refine"].sum()),
+            "time_compute": self._time_compute,
+            "time_apply": self._time_apply,
+            "time_per_signal": float(info["time_signal"].mean()) if n_signals else np.nan,
+        }
 
     def compute(self, y: np.ndarray) -> ty.Tuple[float, float]:
         """Compute correction factors.
 
         This function does not set value in any of the class attributes so can be used in a iterator where values
-        are computed lazily.
+        are computed lazily. It is also safe to call it concurrently from multiple threads.
         """
-        _scale_range = np.array([-0.5, 0.5])
-        scale_opt, shift_opt = 0.0, 1.0
+        shift_opt, scale_opt, _ = self._compute_chunk(np.reshape(y, (1, -1)))
+        return shift_opt[0], scale_opt[0]
+
+    def compute_batch(
+        self, array: np.ndarray, return_info: bool = False, warm_start: ty.Union[bool, int] = False
+    ) -> ty.Tuple:
+        """Compute correction factors for multiple signals at once.
+
+        The signals are processed in chunks (see `chunk_size`) and the grid search is evaluated for every signal in
+        the chunk as a single vectorized operation. Like `compute`, this function does not set value in any of the
+        class attributes.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            2D array of intensities (M x N) that share the separation units
+        return_info : bool (optional)
+            if `True`, dictionary with the number of objective evaluations (`n_evaluations`), iterations
+            (`n_iterations_used`) and interpolated points (`n_points`) used for each signal, its objective value
+            (`score`), the time spent in each phase of the computation (`time_*`) and the total time of the
+            signal (`time_signal`) is also returned. Times are in seconds and are shared equally by the signals that
+            are processed together
+        warm_start : bool or int (optional)
+            warm-start the search of consecutive signals from the solutions of their neighbours - see `run`
+
+        Returns
+        -------
+        shift_opt : np.ndarray
+            1D array of optimized shift values (M)
+        scale_opt : np.ndarray
+            1D array of optimized scale values (M)
+        info : dict
+            dictionary of 1D arrays (M) with information about the optimization - only if `return_info=True`
+        """
+        array = np.asarray(array)
+        if array.ndim != 2 or array.shape[1] != self.x.shape[0]:
+            raise ValueError("Array must be 2D and have the same number of points as the `x` array.")
+        warm_start = self._check_warm_start(warm_start)
+        if warm_start:
+            shift_opt, scale_opt, info = self._compute_warm_start(array, warm_start)
+        else:
+            shift_opt, scale_opt, info = self._compute_chunked(array)
+        if return_info:
+            return shift_opt, scale_opt, info
+        return shift_opt, scale_opt
 
-        # set to back to the user input arguments (or default)
-        _shift = self.shift_range.copy()
-        _scale = self._scale_range.copy()
+    def _check_warm_start(self, warm_start: ty.Union[bool, int]) -> int:
+        """Convert `warm_start` to the spacing of the signals that are computed using the full search range"""
+        if warm_start is True:
+            warm_start = 8
+        if not warm_start:
+            return 0
+        if not isinstance(warm_start, (int, np.integer)) or warm_start < 2:
+            raise ValueError("Value of 'warm_start' must be a boolean or an integer above 1!")
+        if self.optimizer != "grid":
+            raise ValueError("Warm start is only supported by the 'grid' optimizer.")
+        return int(warm_start)
+
+    def _compute_chunked(
+        self,
+        array: np.ndarray,
+        seed: ty.Optional[ty.Tuple[np.ndarray, np.ndarray]] = None,
+        n_skip: int = 0,
+    ) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+        """Compute correction factors for each signal in `array` in memory-bounded chunks"""
+        n_signals = array.shape[0]
+        shift_opt, scale_opt = np.zeros(n_signals), np.ones(n_signals)
+        info = {key: np.zeros(n_signals, dtype=dtype) for key, dtype in self._info_fields.items()}
+
+        chunk_size = self.chunk_size
+        for start in range(0, n_signals, chunk_size):
+            stop = min(start + chunk_size, n_signals)
+            chunk_seed = None if seed is None else (seed[0][start:stop], seed[1][start:stop])
+            shift_opt[start:stop], scale_opt[start:stop], chunk_info = self._compute_chunk(
+                array[start:stop], chunk_seed, n_skip
+            )
+            for key, values in chunk_info.items():
+                info[key][start:stop] = values
+        return shift_opt, scale_opt, info
 
-        # generate interpolation function for each signal - instantiation of the interpolator can be quite slow,
-        # so you can slightly increase the number of iterations without significant slowdown of the process
-        func = generate_function(self.method, self.x, y)
+    def _compute_warm_start(
+        self,
+        array: np.ndarray,
+        spacing: int,
+        block_size: ty.Optional[int] = None,
+        progress: ty.Optional[ProgressTracker] = None,
+        start: int = 0,
+        stop: ty.Optional[int] = None,
+    ) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+        """Compute correction factors by warm-starting signals from the solutions of their neighbours
+
+        Signals are processed in contiguous blocks of about `block_size` signals (`chunk_size` by default) so only
+        one block is read at a time, e.g. from `np.memmap`. The blocks start at anchor signals and the anchor that
+        follows the last signals of a block is computed together with the block, so the solutions (and therefore the
+        seeds) do not depend on the size of the blocks. If the `progress` tracker is specified, it is updated after
+        each block and the computation stops once the operation is cancelled.
+
+        Only the signals between `start` (which must be a multiple of `spacing`) and `stop` are computed and
+        returned. The anchors before and after them that seed their first and last signals are computed as well, so
+        the signals can be split between parallel tasks without changing the results.
+        """
+        n_signals = array.shape[0]
+        stop = n_signals if stop is None else stop
+        # anchor signals are computed using the full search range
+        anchors = np.unique(np.r_[np.arange(0, n_signals, spacing), n_signals - 1])
+        # the first signals are also seeded by the preceding anchor and the last signals by the following anchor
+        n_computed = max(0, np.searchsorted(anchors, start) - 1)
+        offset = anchors[n_computed]
+        n_rows = anchors[np.searchsorted(anchors, stop - 1)] + 1 - offset
+
+        shift_opt, scale_opt = np.zeros(n_rows), np.ones(n_rows)
+        info = {key: np.zeros(n_rows, dtype=dtype) for key, dtype in self._info_fields.items()}
+
+        def _update(rows: np.ndarray, result: ty.Tuple):
+            rows = rows - offset
+            shift_opt[rows], scale_opt[rows] = result[0], result[1]
+            for key, values in result[2].items():
+                if key == "score":
+                    info[key][rows] = values
+                else:
+                    info[key][rows] += values
+
+        n_skip = min(WARM_START_LEVELS, self.n_iterations - 1)
+        factor = self._reduce_range_factor**n_skip * 0.5 * (1 - self._reduce_range_factor)
+        block_size = max(1, (block_size or self.chunk_size) // spacing) * spacing
+        for block_start in range(start, stop, block_size):
+            block_stop = min(block_start + block_size, stop)
+            # signals are read through contiguous slice, including the anchors that precede and follow the block
+            n_anchors = np.searchsorted(anchors, block_stop - 1) + 1
+            block_offset = min(block_start, anchors[n_computed])
+            block = array[block_offset : anchors[n_anchors - 1] + 1]
+            block_anchors = anchors[n_computed:n_anchors]
+            _update(block_anchors, self._compute_chunked(np.asarray(block[block_anchors - block_offset])))
+            n_computed = n_anchors
+
+            rows = np.setdiff1d(np.arange(block_start, block_stop), anchors)
+            if rows.size:
+                # remaining signals start from the running median of the two preceding and the following anchors
+                position = np.searchsorted(anchors, rows)
+                neighbours = anchors[np.clip(position[:, np.newaxis] + np.array([-2, -1, 0]), 0, anchors.size - 1)]
+                seed = (
+                    np.median(scale_opt[neighbours - offset], axis=1),
+                    np.median(shift_opt[neighbours - offset], axis=1),
+                )
+                reference = np.median(info["score"][neighbours - offset], axis=1)
+                _update(rows, self._compute_chunked(np.asarray(block[rows - block_offset]), seed, n_skip))
+
+                # fallback to the full search range if the objective value dropped or the solution is at the edge of
+                # the narrow window (the optimum is likely outside of it)
+                fallback = info["score"][rows - offset] < (1 - WARM_START_TOL) * reference
+                fallback |= np.abs(scale_opt[rows - offset] - seed[0]) > factor * np.ptp(self._scale_range)
+                fallback |= np.abs(shift_opt[rows - offset] - seed[1]) > factor * np.ptp(self.shift_range)
+                rows = rows[fallback]
+                if rows.size:
+                    LOGGER.debug(f"Warm start failed for {rows.size} signals - using the full search range instead")
+                    _update(rows, self._compute_chunked(np.asarray(block[rows - block_offset])))
+            if progress is not None and progress.update(block_stop):
+                break
+        rows = slice(start - offset, stop - offset)
+        return shift_opt[rows], scale_opt[rows], {key: values[rows] for key, values in info.items()}
+
+    def _compute_chunk(
+        self,
+        array: np.ndarray,
+        seed: ty.Optional[ty.Tuple[np.ndarray, np.ndarray]] = None,
+        n_skip: int = 0,
+    ) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+        """Compute correction factors for a 2D array of signals by grid search that is vectorized over signals.
+
+        If `seed` (scale and shift values) is specified, the search starts from the window centred on it at the
+        level `n_skip` of the grid search.
+        """
+        if self.optimizer == "fft":
+            return self._compute_fft(array)
+
+        t_start = time.perf_counter()
+        t_interpolators, t_objective, t_select, t_refine = 0.0, 0.0, 0.0, 0.0
+        # take a snapshot of the parameters so that the computation is not affected by changes made in other threads
+        n_iterations, search_space, optimizer = self.n_iterations, self._search_space, self.optimizer
+        reduce_range_factor, use_kernel = self._reduce_range_factor, self._use_kernel
+        xtol, stol, gain_tol, dtype = self.xtol, self.stol, self.gain_tol, self.compute_dtype
+        corr_sig_x, corr_sig_y = self._corr_sig_x, self._corr_sig_y
+        _scale_range = np.array([-0.5, 0.5])
+        n_signals = array.shape[0]
+        shift_opt, scale_opt = np.zeros(n_signals), np.ones(n_signals)
+        score_opt = np.full(n_signals, -np.inf)
+        n_iterations_used = np.zeros(n_signals, dtype=np.int64)
+        n_points = np.zeros(n_signals, dtype=np.int64)
+
+        # set to back to the user input arguments (or default) - each signal has its own search range
+        _shift = np.tile(self.shift_range.astype(np.float64), (n_signals, 1))
+        _scale = np.tile(self._scale_range.astype(np.float64), (n_signals, 1))
+        if seed is not None:
+            # narrow window centred on the seed which corresponds to the window at the level `n_skip`
+            _scale = seed[0][:, np.newaxis] + _scale_range * np.diff(_scale) * reduce_range_factor**n_skip
+            _shift = seed[1][:, np.newaxis] + _scale_range * np.diff(_shift) * reduce_range_factor**n_skip
+            n_iterations = n_iterations - n_skip
+
+        # signals are optionally reduced to the proxy representation
+        if self._proxy_sampling is not None:
+            array = self._reduce(array)
+        array = np.asarray(array, dtype=dtype)
 
         # iterate to estimate the shift and scale - at each iteration, the grid search is readjusted and the
-        # shift/scale values are optimized further
-        for n_iter in range(self.n_iterations):
-            # scale and shift search space
-            scale_grid = _scale[0] + self._search_space[:, (n_iter * 2) - 2] * np.diff(_scale)
-            shift_grid = _shift[0] + self._search_space[:, (n_iter * 2) + 1] * np.diff(_shift)
-            temp = (
-                np.reshape(scale_grid, (scale_grid.shape[0], 1)) * np.reshape(self._corr_sig_x, (1, self._corr_sig_l))
-                + np.tile(shift_grid, [self._corr_sig_l, 1]).T
+        # shift/scale values are optimized further. Local optimizers only use the first level of the grid to find
+        # the starting point. The first iterations can be performed on the coarse levels of the signal pyramid (one
+        # iteration per level) while the remaining iterations use the full resolution
+        n_levels = n_iterations if optimizer == "grid" else 1
+        n_coarse = min(len(self._pyramid_sampling), n_levels - 1)
+        stages = [(2 ** (n_coarse - i), 1) for i in range(n_coarse)] + [(1, n_levels - n_coarse)]
+        check_convergence = optimizer == "grid" and any(tol is not None for tol in (xtol, stol, gain_tol))
+        # signals are removed from the active set once they converge
+        active = np.arange(n_signals)
+        # all signals share the search window of the first level unless they are seeded
+        shared_window = seed is None
+        for factor, n_stage in stages:
+            t_phase = time.perf_counter()
+            x, x_sorted, support, operators = self._get_sampling(factor)
+            stage_array, stage_sig_x, stage_sig_y = array, corr_sig_x, corr_sig_y
+            if factor > 1:
+                # both signals and the synthetic signal are downsampled. Coarse levels always come first so all
+                # signals are still active
+                stage_array = bin_signal(array, factor).astype(dtype, copy=False)
+                stage_sig_x, stage_sig_y = corr_sig_x[::factor], corr_sig_y[::factor]
+            # the interpolated values (and the scores) are computed in the compute type
+            stage_sig_y = stage_sig_y.astype(dtype, copy=False)
+
+            # generate interpolation function for each signal - instantiation of the interpolator can be quite slow,
+            # so you can slightly increase the number of iterations without significant slowdown of the process.
+            # Linear interpolation of the shared search window of the first level is performed using a sparse operator
+            # that scores all signals at once (and the compiled kernel does not need them at all). Once each signal
+            # has its own window, building an operator per signal is slower than the interpolators. Other methods
+            # evaluate the shared window for many signals at once (see `_score_shared`)
+            use_operator = self.method == "linear" and x_sorted
+            use_shared = not use_operator and self.method != "linear"
+            only_shared = shared_window and n_stage == 1 and (use_operator or use_shared)
+            funcs = {}
+            if (not (use_operator and use_kernel) and not only_shared) or (optimizer != "grid" and factor == 1):
+                # interpolators are only built over the points around the reference peaks
+                x_support = x if support is None else x[support]
+                funcs = {
+                    j: generate_function(
+                        self.method, x_support, y if support is None else y[support], assume_sorted=x_sorted
+                    )
+                    for j, y in zip(active, stage_array[active] if active.size < n_signals else stage_array)
+                }
+            t_interpolators += time.perf_counter() - t_phase
+
+            for stage_iteration in range(n_stage):
+                t_phase = time.perf_counter()
+                n_active = active.size
+                rows = active if n_active < n_signals else slice(None)
+                index = np.arange(n_active)
+
+                # scale and shift search space (M x grid_steps^2)
+                scale_grid = _scale[rows, :1] + search_space[:, 0] * np.diff(_scale[rows])
+                shift_grid = _shift[rows, :1] + search_space[:, 1] * np.diff(_shift[rows])
+                if use_operator and use_kernel:
+                    scores = score_linear(x, stage_array[rows], scale_grid, shift_grid, stage_sig_x, stage_sig_y)
+                elif use_shared and shared_window:
+                    scores = self._score_shared(
+                        stage_array, x, x_sorted, support, scale_grid[0], shift_grid[0], stage_sig_x, stage_sig_y
+                    )
+                elif use_operator and shared_window:
+                    windows = np.hstack([_scale[rows], _shift[rows]])
+                    scores = self._score_operator(
+                        stage_array[rows], windows, scale_grid, shift_grid, x, operators, stage_sig_x, stage_sig_y
+                    )
+                else:
+                    scores = self._score_interpolators(
+                        [funcs[j] for j in active], scale_grid, shift_grid, stage_sig_x, stage_sig_y
+                    )
+                n_points[rows] += search_space.shape[0] * stage_sig_x.shape[0]
+                shared_window = False
+                t_objective += time.perf_counter() - t_phase
+                t_phase = time.perf_counter()
+
+                # determine the best position
+                i_max = scores.argmax(axis=1)
+                _scale_opt, _shift_opt, _score_opt = (
+                    scale_grid[index, i_max],
+                    shift_grid[index, i_max],
+                    scores[index, i_max],
+                )
+
+                # check which signals have converged - all specified tolerances must be satisfied. Only iterations
+                # at the full resolution are compared
+                converged = np.full(n_active, check_convergence and factor == 1 and stage_iteration > 0)
+                if converged.any():
+                    if xtol is not None:
+                        converged &= np.abs(_shift_opt - shift_opt[rows]) <= xtol
+                    if stol is not None:
+                        converged &= np.abs(_scale_opt - scale_opt[rows]) <= stol
+                    if gain_tol is not None:
+                        converged &= _score_opt - score_opt[rows] <= gain_tol * np.abs(score_opt[rows])
+
+                # save optimum value
+                scale_opt[rows], shift_opt[rows], score_opt[rows] = _scale_opt, _shift_opt, _score_opt
+                n_iterations_used[rows] += 1
+
+                # readjust grid for next iteration_reduce_range_factor
+                _scale[rows] = _scale_opt[:, np.newaxis] + _scale_range * np.diff(_scale[rows]) * reduce_range_factor
+                _shift[rows] = _shift_opt[:, np.newaxis] + _scale_range * np.diff(_shift[rows]) * reduce_range_factor
+                active = active[~converged]
+                t_select += time.perf_counter() - t_phase
+                if active.size == 0:
+                    break
+        n_evaluations = n_iterations_used * search_space.shape[0]
+
+        if optimizer != "grid":
+            t_phase = time.perf_counter()
+            # refine the starting point within the next level of the grid search to the precision of the last level
+            minimize = OPTIMIZER_FUNCS[optimizer]
+            width = np.array([np.ptp(self._scale_range), np.ptp(self.shift_range)], dtype=np.float64)
+            tol = width * reduce_range_factor ** (n_iterations - 1) / max(self.grid_steps - 1, 1)
+            # user-specified tolerances take precedence over the precision of the grid search
+            tol = np.array([tol[0] if stol is None else stol, tol[1] if xtol is None else xtol])
+            free = width > 0
+            # shift and scale are strongly correlated, so the shift is replaced by the position of the center of the
+            # synthetic signal, which makes the objective much easier to navigate
+            center = np.average(corr_sig_x, weights=corr_sig_y) if free[0] else 0.0
+            # the grid search can drift away from the window of its second level by up to f / (1 - f) of its size
+            _scale = scale_opt[:, np.newaxis] + (_scale - scale_opt[:, np.newaxis]) / (1 - reduce_range_factor)
+            _shift = shift_opt[:, np.newaxis] + (_shift - shift_opt[:, np.newaxis]) / (1 - reduce_range_factor)
+            for i, func in funcs.items():
+                start = np.array([scale_opt[i], shift_opt[i] + scale_opt[i] * center])
+                bounds = np.vstack([_scale[i], _shift[i] + np.sort(_scale[i] * center)])[free]
+                objective = self._get_objective(func, start, free, center, corr_sig_x, corr_sig_y)
+                options = {}
+                if optimizer == "brent":
+                    # the bounds span several steps of the grid search so the 1D searches are limited to about one
+                    # step around the starting point rather than jumping to another local optimum
+                    grid_step = np.ptp(bounds, axis=1) * (1 - reduce_range_factor) / reduce_range_factor
+                    options["step"] = grid_step / max(self.grid_steps - 1, 1)
+                value_start = objective(start[free])
+                x_opt, n_local = minimize(objective, start[free], bounds, tol[free], **options)
+                value_opt = objective(x_opt)
+                # the starting point is kept if the local optimizer did not improve it
+                if value_opt <= value_start:
+                    start[free] = x_opt
+                scale_opt[i], shift_opt[i] = start[0], start[1] - start[0] * center
+                score_opt[i] = -min(value_opt, value_start)
+                n_evaluations[i] += n_local + 2
+                n_points[i] += (n_local + 2) * corr_sig_x.shape[0]
+            t_refine = time.perf_counter() - t_phase
+        info = {"n_evaluations": n_evaluations, "n_iterations_used": n_iterations_used, "score": score_opt}
+        info.update(
+            self._get_timings(
+                n_signals, n_points, t_interpolators, t_objective, t_select, t_refine, time.perf_counter() - t_start
             )
-            # interpolate at each iteration. Need to remove NaNs which can be introduced by certain (e.g.
-            # PCHIP) interpolator
-            temp = np.nan_to_num(func(temp.flatten("C")).reshape(temp.shape))
+        )
+        return shift_opt, scale_opt, info
 
-            # determine the best position
-            i_max = np.dot(temp, self._corr_sig_y).argmax()
+    @staticmethod
+    def _get_timings(
+        n_signals: int,
+        n_points: np.ndarray,
+        t_interpolators: float,
+        t_objective: float,
+        t_select: float,
+        t_refine: float,
+        t_total: float,
+    ) -> ty.Dict[str, np.ndarray]:
+        """Get per-signal counters and timings of signals that were processed together."""
+        return {
+            "n_points": n_points,
+            "time_interpolators": np.full(n_signals, t_interpolators / n_signals),
+            "time_objective": np.full(n_signals, t_objective / n_signals),
+            "time_select": np.full(n_signals, t_select / n_signals),
+            "time_refine": np.full(n_signals, t_refine / n_signals),
+            "time_signal": np.full(n_signals, t_total / n_signals),
+        }
 
-            # save optimum value
-            scale_opt = scale_grid[i_max]
-            shift_opt = shift_grid[i_max]
+    @staticmethod
+    def _get_objective(
+        func: ty.Callable,
+        start: np.ndarray,
+        free: np.ndarray,
+        center: float,
+        corr_sig_x: np.ndarray,
+        corr_sig_y: np.ndarray,
+    ) -> ty.Callable[[np.ndarray], float]:
+        """Return objective function of the free (scale, center position) parameters minimized by local optimizers."""
+
+        def _objective(values: np.ndarray) -> float:
+            params = start.copy()
+            params[free] = values
+            return -np.dot(np.nan_to_num(func(params[0] * (corr_sig_x - center) + params[1])), corr_sig_y)
+
+        return _objective
+
+    def align_iter(
+        self, signals: ty.Iterable[np.ndarray], window: ty.Optional[int] = None
+    ) -> ty.Iterator[ty.Tuple[np.ndarray, float, float]]:
+        """Lazily align signals from an iterable without creating the full 2D array.
+
+        Signals are collected into a window of at most `window` signals, the correction factors are computed for the
+        whole window at once and the aligned signals are yielded one by one. Only the current window is kept in
+        memory so this method can be used for datasets that are much larger than the available memory. It does not
+        set value in any of the class attributes.
 
-            # readjust grid for next iteration_reduce_range_factor
-            _scale = scale_opt + _scale_range * np.diff(_scale) * self._reduce_range_factor
-            _shift = shift_opt + _scale_range * np.diff(_shift) * self._reduce_range_factor
-        return shift_opt, scale_opt
+        Parameters
+        ----------
+        signals : Iterable[np.ndarray]
+            iterable of 1D arrays of intensities (N) that share the separation units
+        window : int (optional)
+            maximum number of signals that are kept in memory. Default: `chunk_size`
+
+        Yields
+        ------
+        y : np.ndarray
+            aligned signal
+        shift_value : float
+            optimized shift value
+        scale_value : float
+            optimized scale value
+        """
+        window = self.chunk_size if window is None else window
+        if window < 1:
+            raise ValueError("Value of 'window' must be above 0!")
+
+        buffer = []
+        for y in signals:
+            buffer.append(np.asarray(y))
+            if len(buffer) == window:
+                yield from self._align_window(buffer)
+                buffer = []
+        if buffer:
+            yield from self._align_window(buffer)
+
+    def _align_window(self, buffer: ty.List[np.ndarray]) -> ty.Iterator[ty.Tuple[np.ndarray, float, float]]:
+        """Compute and apply correction factors to a window of signals."""
+        shift_opt, scale_opt = self.compute_batch(np.stack(buffer))
+        # use the same precision as the `shift_opt` and `scale_opt` attributes so results match `run` and `apply`
+        shift_opt, scale_opt = shift_opt.astype(np.float32), scale_opt.astype(np.float32)
+        for y, shift_value, scale_value in zip(buffer, shift_opt, scale_opt):
+            dtype = self._get_output_dtype(y.dtype)
+            if self._only_shift:
+                y = self._shift(y, np.round(shift_value))
+            else:
+                y = self._apply(y, shift_value, scale_value)
+            yield y.astype(dtype, copy=False), shift_value, scale_value
+
+    def _compute_fft(self, array: np.ndarray) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+        """Compute shift values by cross-correlating the synthetic signal with each signal."""
+        t_start = time.perf_counter()
+        n_signals = array.shape[0]
+        index = np.arange(n_signals)
+        shift_min, shift_max = np.sort(self.shift_range)
+        lags = np.arange(np.ceil(shift_min), np.floor(shift_max) + 1, dtype=np.int64)
+        if lags.size == 0:
+            lags = np.array([np.round(shift_min)], dtype=np.int64)
+
+        # synthetic signal sampled at each point of the signal (signals are always aligned by index)
+        template = np.zeros(self.x.shape[0], dtype=self.compute_dtype)
+        for peak, weight in zip(self.peaks, self.weights):
+            window = np.abs(self.x - peak) <= self.gaussian_ratio * self.gaussian_width
+            template[window] += weight * np.exp(-np.square((self.x[window] - peak) / self.gaussian_width))
+
+        t_interpolators = time.perf_counter() - t_start
+        t_phase = time.perf_counter()
+        correlation = cross_correlate(np.asarray(array, dtype=self.compute_dtype), template, lags)
+        t_objective = time.perf_counter() - t_phase
+        t_phase = time.perf_counter()
+        i_max = correlation.argmax(axis=1)
+
+        # refine the position of the maximum by fitting parabola through it and its neighbours
+        left = correlation[index, np.maximum(i_max - 1, 0)]
+        center = correlation[index, i_max]
+        right = correlation[index, np.minimum(i_max + 1, lags.size - 1)]
+        denominator = left - 2 * center + right
+        mask = (i_max > 0) & (i_max < lags.size - 1) & (denominator < 0)
+        offset = np.zeros(n_signals)
+        offset[mask] = 0.5 * (left[mask] - right[mask]) / denominator[mask]
+        shift_opt = np.clip(lags[i_max] + offset, shift_min, shift_max)
+        info = {
+            "n_evaluations": np.full(n_signals, lags.size, dtype=np.int64),
+            "n_iterations_used": np.ones(n_signals, dtype=np.int64),
+            "score": center,
+        }
+        t_select = time.perf_counter() - t_phase
+        # signals are not interpolated
+        info.update(
+            self._get_timings(
+                n_signals,
+                np.zeros(n_signals, dtype=np.int64),
+                t_interpolators,
+                t_objective,
+                t_select,
+                0.0,
+                time.perf_counter() - t_start,
+            )
+        )
+        return shift_opt, np.ones(n_signals), info
+
+    def _score_interpolators(
+        self,
+        funcs: ty.List[ty.Callable],
+        scale_grid: np.ndarray,
+        shift_grid: np.ndarray,
+        corr_sig_x: np.ndarray,
+        corr_sig_y: np.ndarray,
+    ) -> np.ndarray:
+        """Score the search grid of each signal using its interpolator.
+
+        The grid is evaluated in blocks of cells so the interpolated values (and the positions at which they are
+        interpolated) never exceed the `memory_limit`. The blocks are written to the scratch buffers of the workspace
+        that are reused by all iterations and signals. Interpolated values are in the type of the synthetic signal.
+        """
+        n_cells, n_points = scale_grid.shape[1], corr_sig_x.shape[0]
+        block_size = min(n_cells, self._get_block_size(n_points, corr_sig_y.dtype))
+        # positions are kept in double precision as the separation units can be large (e.g. m/z values)
+        points = self._workspace.get("points", (block_size, n_points), np.float64)
+        values = self._workspace.get("values", (block_size, n_points), corr_sig_y.dtype)
+        scores = np.empty(scale_grid.shape)
+        for i, func in enumerate(funcs):
+            for start in range(0, n_cells, block_size):
+                stop = min(start + block_size, n_cells)
+                _points, _values = points[: stop - start], values[: stop - start]
+                np.multiply(scale_grid[i, start:stop, np.newaxis], corr_sig_x, out=_points)
+                _points += shift_grid[i, start:stop, np.newaxis]
+                # need to remove NaNs which can be introduced by certain (e.g. PCHIP) interpolator
+                _values[:] = func(_points.ravel()).reshape(_points.shape)
+                np.nan_to_num(_values, copy=False)
+                scores[i, start:stop] = np.dot(_values, corr_sig_y)
+        return scores
+
+    def _score_shared(
+        self,
+        array: np.ndarray,
+        x: np.ndarray,
+        x_sorted: bool,
+        support: ty.Optional[np.ndarray],
+        scale_grid: np.ndarray,
+        shift_grid: np.ndarray,
+        corr_sig_x: np.ndarray,
+        corr_sig_y: np.ndarray,
+    ) -> np.ndarray:
+        """Score the search grid that is shared by all signals.
+
+        Signals are interpolated together by a single interpolator per group of signals, which shares the search of
+        the intervals (and the evaluation overhead) between them, so it is much faster than interpolating each signal
+        separately. The groups are limited so the interpolated values fit the `memory_limit`. The values of each
+        signal are copied to the same scratch buffers and the grid is split into the same blocks as in
+        `_score_interpolators`, so the scores are identical to the scores of the signals interpolated one at a time.
+        """
+        n_cells, n_points = scale_grid.shape[0], corr_sig_x.shape[0]
+        block_size = min(n_cells, self._get_block_size(n_points, corr_sig_y.dtype))
+        # half of the memory that is not used by the scratch buffers is used by the values of the group (and the
+        # temporary arrays of the same size created by the interpolator)
+        n_workspace = block_size * n_points * (16 + np.dtype(corr_sig_y.dtype).itemsize)
+        group_size = max(1, (self.memory_limit - n_workspace) // 2 // (block_size * n_points * 16))
+        points = self._workspace.get("points", (block_size, n_points), np.float64)
+        values = self._workspace.get("values", (block_size, n_points), corr_sig_y.dtype)
+        x_support = x if support is None else x[support]
+        scores = np.empty((array.shape[0], n_cells))
+        for group_start in range(0, array.shape[0], group_size):
+            group = array[group_start : group_start + group_size]
+            func = generate_function(
+                self.method, x_support, group if support is None else group[:, support], assume_sorted=x_sorted
+            )
+            for start in range(0, n_cells, block_size):
+                stop = min(start + block_size, n_cells)
+                _points, _values = points[: stop - start], values[: stop - start]
+                np.multiply(scale_grid[start:stop, np.newaxis], corr_sig_x, out=_points)
+                _points += shift_grid[start:stop, np.newaxis]
+                group_values = func(_points.ravel())
+                for i, signal_values in enumerate(group_values, start=group_start):
+                    _values[:] = signal_values.reshape(_points.shape)
+                    np.nan_to_num(_values, copy=False)
+                    scores[i, start:stop] = np.dot(_values, corr_sig_y)
+        return scores
+
+    def _get_block_size(self, n_points: int, dtype: np.dtype) -> int:
+        """Get number of grid cells that are interpolated at once so that the scratch buffers fit the memory limit.
+
+        Each cell requires the positions, the values returned by the interpolator (double precision) and the values
+        in the compute type.
+        """
+        return max(1, self.memory_limit // (n_points * (16 + np.dtype(dtype).itemsize)))
+
+    def _score_operator(
+        self,
+        array: np.ndarray,
+        windows: np.ndarray,
+        scale_grid: np.ndarray,
+        shift_grid: np.ndarray,
+        x: np.ndarray,
+        operators: LRUCache,
+        corr_sig_x: np.ndarray,
+        corr_sig_y: np.ndarray,
+    ) -> np.ndarray:
+        """Score the search grid of each signal using sparse linear interpolation operators.
+
+        Signals that have the same search window (scale and shift ranges) share the same grid and are scored together
+        with a single sparse x dense product. It is only used for the first level of the grid search where all signals
+        share the window. The operators are created in the type of the synthetic signal.
+        """
+        scores = np.empty(scale_grid.shape)
+        windows, inverse = np.unique(windows, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for i, window in enumerate(windows):
+            rows = np.flatnonzero(inverse == i)
+            key = window.tobytes() + corr_sig_y.dtype.str.encode()
+            operator = operators.get(key)
+            if operator is None:
+                points = scale_grid[rows[0], :, np.newaxis] * corr_sig_x + shift_grid[rows[0], :, np.newaxis]
+                operator = interpolation_operator(x, points, corr_sig_y).astype(corr_sig_y.dtype, copy=False)
+                operators.put(key, operator)
+            scores[rows] = (operator @ array[rows].T).T
+        return scores
+
+    def apply(
+        self,
+        return_shifts: bool = None,
+        out: ty.Optional[np.ndarray] = None,
+        callback: ty.Optional[ty.Callable[[Progress], ty.Optional[bool]]] = None,
+        callback_every: ty.Optional[int] = None,
+    ):
+        """Align the signals against the computed values
 
-    def apply(self, return_shifts: bool = None):
-        """Align the signals against the computed values"""
+        Parameters
+        ----------
+        return_shifts : bool (optional)
+            decide whether shift parameter `shift_opt` should also be returned
+        out : np.ndarray (optional)
+            2D array (M x N) where the aligned signals should be written, e.g. `np.memmap`. Signals are written one
+            row at a time
+        callback : Callable (optional)
+            function that is called with the `Progress` of the operation every `callback_every` signals. If it
+            returns `True`, the operation is cancelled and only the first `progress.n_done` signals are aligned
+        callback_every : int (optional)
+            number of signals between the calls of `callback`. Default: 1% of the signals
+        """
         if not self._computed:
             warnings.warn("Aligning data without computing optimal alignment parameters", UserWarning)
         self._return_shifts = return_shifts if return_shifts is not None else self._return_shifts
+        if out is not None:
+            self.array_aligned = self._check_out(out)
+        self._check_output()
 
         if self._only_shift:
-            self.shift()
+            self.shift(callback=callback, callback_every=callback_every)
         else:
-            self.align()
+            self.align(callback=callback, callback_every=callback_every)
 
         # return aligned data and shifts
         if self._return_shifts:
@@ -352,7 +1508,7 @@ class Aligner:
         # only return data
         return self.array_aligned
 
-    def align(self, shift_opt=None, scale_opt=None):
+    def align(self, shift_opt=None, scale_opt=None, callback=None, callback_every=None):
         """Realign array based on the optimized shift and scale parameters
 
         Parameters
@@ -361,27 +1517,47 @@ class Aligner:
             vector containing values by which to shift the array
         scale_opt : Optional[np.ndarray]
             vector containing values by which to rescale the array
+        callback : Optional[Callable]
+            function that is called with the progress of the operation - see `apply`
+        callback_every : Optional[int]
+            number of signals between the calls of `callback` - see `apply`
         """
-        t_start = time.time()
+        self._check_output()
+        progress = self._get_progress_tracker("align", callback, callback_every, self._default_callback_every)
+        t_start, t_counter = time.time(), time.perf_counter()
         if shift_opt is None:
             shift_opt = self.shift_opt
         if scale_opt is None:
             scale_opt = self.scale_opt
 
         # realign based on provided values
-        for iteration, y in enumerate(self.array):
-            # interpolate back to the original domain
-            self.array_aligned[iteration] = self._apply(y, shift_opt[iteration], scale_opt[iteration])
+        if self.n_jobs > 1 and self.n_signals > 1:
+            align_parallel(
+                self, self.array, self.array_aligned, shift_opt, scale_opt, self.n_jobs, self.backend, progress
+            )
+        else:
+            for iteration, y in enumerate(self.array):
+                # interpolate back to the original domain
+                self.array_aligned[iteration] = self._apply(y, shift_opt[iteration], scale_opt[iteration])
+                n_done = iteration + 1
+                if (n_done % progress.every == 0 or n_done == self.n_signals) and progress.update(n_done):
+                    break
         self.shift_values = self.shift_opt
 
-        LOGGER.debug(f"Re-aligned {self.n_signals} signals " + time_loop(t_start, self.n_signals + 1, self.n_signals))
+        self._time_apply = time.perf_counter() - t_counter
+        self.progress = progress.progress
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            n_done = progress.n_done
+            LOGGER.debug(f"Re-aligned {n_done} signals " + time_loop(t_start, n_done + 1, n_done))
 
     def _apply(self, y: np.ndarray, shift_value: float, scale_value: float):
         """Apply alignment correction to array `y`."""
-        func = generate_function(self.method, (self.x - shift_value) / scale_value, y)
+        assume_sorted = self._x_sorted and bool(np.all(scale_value > 0))
+        y = np.asarray(y, dtype=self.compute_dtype)
+        func = generate_function(self.method, (self.x - shift_value) / scale_value, y, assume_sorted=assume_sorted)
         return np.nan_to_num(func(self.x))
 
-    def shift(self, shift_opt=None):
+    def shift(self, shift_opt=None, callback=None, callback_every=None):
         """Quickly shift array based on the optimized shift parameters.
 
         This method does not interpolate but rather moves the data left and right without applying any scaling.
@@ -390,19 +1566,92 @@ class Aligner:
         ----------
         shift_opt: Optional[np.ndarray]
             vector containing values by which to shift the array
+        callback : Optional[Callable]
+            function that is called with the progress of the operation - see `apply`
+        callback_every : Optional[int]
+            number of signals between the calls of `callback` - see `apply`
         """
-        t_start = time.time()
+        self._check_output()
+        progress = self._get_progress_tracker("shift", callback, callback_every, self._default_callback_every)
+        t_start, t_counter = time.time(), time.perf_counter()
         if shift_opt is None:
             shift_opt = np.round(self.shift_opt).astype(np.int32)
 
-        # quickly shift based on provided values
-        for iteration, y in enumerate(self.array):
-            self.array_aligned[iteration] = self._shift(y, shift_opt[iteration])
+        # quickly shift based on provided values - all signals are shifted at once
+        if self.n_jobs > 1 and self.n_signals > 1 and self.backend == "thread":
+            shift_parallel(self, self.array, self.array_aligned, shift_opt, self.n_jobs, progress)
+        else:
+            for start in range(0, self.n_signals, progress.every):
+                stop = min(start + progress.every, self.n_signals)
+                self._shift_block(self.array[start:stop], self.array_aligned[start:stop], shift_opt[start:stop])
+                if progress.update(stop):
+                    break
         self.shift_values = shift_opt
 
-        LOGGER.debug(f"Re-aligned {self.n_signals} signals " + time_loop(t_start, self.n_signals + 1, self.n_signals))
+        self._time_apply = time.perf_counter() - t_counter
+        self.progress = progress.progress
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            n_done = progress.n_done
+            LOGGER.debug(f"Re-aligned {n_done} signals " + time_loop(t_start, n_done + 1, n_done))
 
     @staticmethod
     def _shift(y: np.ndarray, shift_value: float):
         """Apply shift correction to array `y`."""
         return shift(y, -int(shift_value))
+
+    def _shift_block(self, array: np.ndarray, out: np.ndarray, shift_opt: np.ndarray):
+        """Apply shift correction to each row of `array` and write them to `out`."""
+        shift_rows(array, -np.asarray(shift_opt).reshape(-1).astype(np.int64), out=out)
+
+    @property
+    def _default_callback_every(self) -> int:
+        """Number of signals between the calls of progress callback when applying the correction factors."""
+        return max(1, math.ceil(self.n_signals / 100))
+
+    @property
+    def memory_mode(self) -> str:
+        """Determines where the aligned signals are written."""
+        return self._memory_mode
+
+    def _get_output(self, memory_mode: ty.Optional[str], out: ty.Optional[np.ndarray]) -> ty.Optional[np.ndarray]:
+        """Get array where the aligned signals will be written, based on the memory mode."""
+        if memory_mode is None:
+            memory_mode = "external" if out is not None else "copy"
+        if memory_mode not in MEMORY_MODES:
+            raise ValueError(f"Memory mode `{memory_mode}` not found in the memory mode options: {MEMORY_MODES}")
+        if (memory_mode == "external") != (out is not None):
+            raise ValueError("The `out` array must be specified when (and only when) using the 'external' memory mode.")
+        self._memory_mode = memory_mode
+
+        if memory_mode == "compute":
+            return None
+        if memory_mode == "inplace":
+            if not self.array.flags.writeable:
+                raise ValueError("Cannot align signals in-place as the input array is read-only.")
+            if self._output_dtype is not None and self._output_dtype != self.array.dtype:
+                raise ValueError("Cannot align signals in-place when `output_dtype` differs from the input type.")
+            return self.array
+        if memory_mode == "external":
+            return self._check_out(out)
+        return np.zeros(self.array.shape, dtype=self._get_output_dtype(self.array.dtype))
+
+    def _check_output(self):
+        """Check that there is an array where the aligned signals can be written."""
+        if self.array_aligned is None:
+            raise ValueError(
+                "Cannot align signals in the 'compute' memory mode - specify the `out` array or use different mode."
+            )
+
+    def _check_out(self, out: np.ndarray) -> np.ndarray:
+        """Check that the output array has the correct shape."""
+        if not isinstance(out, np.ndarray) or out.shape != self.array.shape:
+            raise ValueError(f"Output array must be a numpy array with shape {self.array.shape}.")
+        if self._output_dtype is not None and self._output_dtype != out.dtype:
+            raise ValueError(f"Output array must be of type `{self._output_dtype}`.")
+        return out
+
+    def _detached(self) -> "Aligner":
+        """Return shallow copy of the aligner without references to the (potentially large) data arrays."""
+        aligner = copy.copy(self)
+        aligner.array, aligner.array_aligned, aligner._info = None, None, None
+        return aligner
@@ -0,0 +1,183 @@
+"""Scikit-learn compatible estimator interface"""
+import inspect
+import typing as ty
+
+import numpy as np
+
+from .align import Aligner
+
+
+class AlignmentEstimator:
+    """Estimator that computes the correction factors in `fit` and applies them in `transform`
+
+    The estimator follows the scikit-learn conventions (without depending on it) so it can be used in preprocessing
+    pipelines, cloned and cached. It does not keep reference to the signals, so it can be cheaply pickled and sent
+    to other processes - only the alignment parameters and the fitted correction factors are stored. See `Aligner`
+    for the description of the parameters.
+
+    Attributes
+    ----------
+    shift_opt_ : np.ndarray
+        1D array of optimized shift values (M)
+    scale_opt_ : np.ndarray
+        1D array of optimized scale values (M)
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        peaks: ty.Iterable[float],
+        method: str = "cubic",
+        width: float = 10,
+        ratio: float = 2.5,
+        resolution: int = 100,
+        iterations: int = 5,
+        grid_steps: int = 20,
+        shift_range: ty.Optional[ty.Tuple[int, int]] = None,
+        weights: ty.Optional[ty.List[float]] = None,
+        align_by_index: bool = False,
+        only_shift: bool = False,
+        memory_limit: ty.Optional[int] = None,
+        n_jobs: ty.Optional[int] = None,
+        backend: str = "process",
+        optimizer: str = "grid",
+        xtol: ty.Optional[float] = None,
+        stol: ty.Optional[float] = None,
+        gain_tol: ty.Optional[float] = None,
+        proxy: ty.Optional[str] = None,
+        pyramid_levels: int = 0,
+        compute_dtype: ty.Optional[str] = None,
+        output_dtype: ty.Optional[str] = None,
+        kernel: str = "auto",
+        warm_start: ty.Union[bool, int] = False,
+    ):
+        self.x = x
+        self.peaks = peaks
+        self.method = method
+        self.width = width
+        self.ratio = ratio
+        self.resolution = resolution
+        self.iterations = iterations
+        self.grid_steps = grid_steps
+        self.shift_range = shift_range
+        self.weights = weights
+        self.align_by_index = align_by_index
+        self.only_shift = only_shift
+        self.memory_limit = memory_limit
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.optimizer = optimizer
+        self.xtol = xtol
+        self.stol = stol
+        self.gain_tol = gain_tol
+        self.proxy = proxy
+        self.pyramid_levels = pyramid_levels
+        self.compute_dtype = compute_dtype
+        self.output_dtype = output_dtype
+        self.kernel = kernel
+        self.warm_start = warm_start
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<method={self.method}; peaks={list(self.peaks)}>"
+
+    @classmethod
+    def _get_param_names(cls) -> ty.List[str]:
+        """Get names of the estimator parameters"""
+        return [name for name in inspect.signature(cls.__init__).parameters if name != "self"]
+
+    def get_params(self, deep: bool = True) -> ty.Dict[str, ty.Any]:
+        """Get parameters of the estimator"""
+        return {name: getattr(self, name) for name in self._get_param_names()}
+
+    def set_params(self, **params) -> "AlignmentEstimator":
+        """Set parameters of the estimator"""
+        valid_params = self._get_param_names()
+        for name, value in params.items():
+            if name not in valid_params:
+                raise ValueError(f"Invalid parameter `{name}` for estimator {self.__class__.__name__}.")
+            setattr(self, name, value)
+        return self
+
+    def _get_aligner(self, X: np.ndarray, out: ty.Optional[np.ndarray] = None, compute: bool = False) -> Aligner:
+        """Create aligner for the signals in `X`"""
+        return Aligner(
+            self.x,
+            X,
+            self.peaks,
+            method=self.method,
+            width=self.width,
+            ratio=self.ratio,
+            resolution=self.resolution,
+            iterations=self.iterations,
+            grid_steps=self.grid_steps,
+            shift_range=self.shift_range,
+            weights=self.weights,
+            align_by_index=self.align_by_index,
+            only_shift=self.only_shift,
+            memory_limit=self.memory_limit,
+            n_jobs=self.n_jobs,
+            backend=self.backend,
+            out=out,
+            memory_mode="compute" if compute else None,
+            optimizer=self.optimizer,
+            xtol=self.xtol,
+            stol=self.stol,
+            gain_tol=self.gain_tol,
+            proxy=self.proxy,
+            pyramid_levels=self.pyramid_levels,
+            compute_dtype=self.compute_dtype,
+            output_dtype=self.output_dtype,
+            kernel=self.kernel,
+        )
+
+    def fit(self, X: np.ndarray, y=None) -> "AlignmentEstimator":
+        """Compute the correction factors for each signal in `X`
+
+        Parameters
+        ----------
+        X : np.ndarray
+            2D array of intensities (M x N)
+        y : None
+            ignored, present for API consistency
+
+        Returns
+        -------
+        self : AlignmentEstimator
+            fitted estimator
+        """
+        aligner = self._get_aligner(X, compute=True)
+        aligner.run(warm_start=self.warm_start)
+        self.shift_opt_ = aligner.shift_opt[:, 0].astype(np.float64)
+        self.scale_opt_ = aligner.scale_opt[:, 0].astype(np.float64)
+        return self
+
+    def transform(self, X: np.ndarray, out: ty.Optional[np.ndarray] = None) -> np.ndarray:
+        """Apply the fitted correction factors to the signals in `X`
+
+        Parameters
+        ----------
+        X : np.ndarray
+            2D array of intensities (M x N) - must have the same number of signals as the array used in `fit`
+        out : np.ndarray (optional)
+            2D array (M x N) where the aligned signals should be written
+
+        Returns
+        -------
+        array_aligned : np.ndarray
+            2D array of aligned signals (M x N)
+        """
+        if not hasattr(self, "shift_opt_"):
+            raise ValueError(f"This {self.__class__.__name__} instance is not fitted yet. Call `fit` first.")
+        aligner = self._get_aligner(X, out=out)
+        if aligner.n_signals != self.shift_opt_.shape[0]:
+            raise ValueError(
+                f"Number of signals ({aligner.n_signals}) does not match the number of fitted signals"
+                f" ({self.shift_opt_.shape[0]})."
+            )
+        aligner.shift_opt[:, 0], aligner.scale_opt[:, 0] = self.shift_opt_, self.scale_opt_
+        aligner._computed = True
+        return aligner.apply(return_shifts=False)
+
+    def fit_transform(self, X: np.ndarray, y=None, out: ty.Optional[np.ndarray] = None) -> np.ndarray:
+        """Compute the correction factors and apply them to the signals in `X`"""
+        return self.fit(X).transform(X, out=out)
@@ -0,0 +1,100 @@
+"""Optional JIT-compiled kernels of the grid search
+
+The kernels are compiled by `numba` (if it is installed) on first use and they are cached on disk so the compilation
+cost is only paid once. `numba` is not imported until a kernel is requested to keep the import of the package quick.
+"""
+import importlib.util
+from functools import lru_cache
+
+import numpy as np
+
+KERNELS = ["auto", "sparse", "numba"]
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def _score_linear(x, array, scale_grid, shift_grid, corr_sig_x, corr_sig_y, out):
+    """Score the search grid of each signal by linearly interpolating it at the rescaled and shifted positions.
+
+    The positions of the synthetic signal are computed, interpolated and multiplied by its intensity in a single pass
+    so no temporary arrays are created. Points outside of `x` are equal to 0.
+    """
+    n_x = x.shape[0]
+    x_min, x_max = x[0], x[n_x - 1]
+    for i in range(array.shape[0]):
+        for j in range(scale_grid.shape[1]):
+            scale, shift = scale_grid[i, j], shift_grid[i, j]
+            total = 0.0
+            lo = 0
+            for k in range(corr_sig_x.shape[0]):
+                point = scale * corr_sig_x[k] + shift
+                if point < x_min or point > x_max:
+                    continue
+                # the points are (mostly) increasing so the search for the interval that contains the point gallops
+                # forward from the previous interval and then bisects it
+                if x[lo] > point:
+                    lo = 0
+                step, hi = 1, lo + 1
+                while hi < n_x - 1 and x[hi] <= point:
+                    lo = hi
+                    step *= 2
+                    hi = lo + step
+                hi = min(hi, n_x - 1)
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if x[mid] <= point:
+                        lo = mid
+                    else:
+                        hi = mid
+                width = x[hi] - x[lo]
+                ratio = (point - x[lo]) / width if width > 0 else 0.0
+                total += corr_sig_y[k] * (array[i, lo] + ratio * (array[i, hi] - array[i, lo]))
+            out[i, j] = total
+
+
+@lru_cache(maxsize=None)
+def get_score_linear_kernel():
+    """Get the compiled `_score_linear` kernel
+
+    The kernel releases the GIL so it can be executed by the 'thread' backend in parallel.
+    """
+    import numba
+
+    return numba.njit(nogil=True, cache=True)(_score_linear)
+
+
+def score_linear(
+    x: np.ndarray,
+    array: np.ndarray,
+    scale_grid: np.ndarray,
+    shift_grid: np.ndarray,
+    corr_sig_x: np.ndarray,
+    corr_sig_y: np.ndarray,
+) -> np.ndarray:
+    """Score the search grid of each signal using the compiled linear interpolation kernel
+
+    The result is the same as `(np.interp(points, x, y, left=0, right=0) * corr_sig_y).sum(axis=-1)` for each signal
+    `y` in `array` where `points` are the positions of the synthetic signal for each point of the search grid.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        1D array of sorted separation units (N)
+    array : np.ndarray
+        2D array of intensities (M x N)
+    scale_grid : np.ndarray
+        2D array of scale values of the search grid of each signal (M x K)
+    shift_grid : np.ndarray
+        2D array of shift values of the search grid of each signal (M x K)
+    corr_sig_x : np.ndarray
+        1D array of the positions of the synthetic signal (L)
+    corr_sig_y : np.ndarray
+        1D array of the intensities of the synthetic signal (L)
+
+    Returns
+    -------
+    scores : np.ndarray
+        2D array of objective values (M x K)
+    """
+    scores = np.empty(scale_grid.shape)
+    get_score_linear_kernel()(x, array, scale_grid, shift_grid, corr_sig_x, corr_sig_y, scores)
+    return scores
@@ -0,0 +1,167 @@
+"""Derivative-free local optimizers used to refine the correction factors found by the coarse grid search."""
+import typing as ty
+
+import numpy as np
+
+
+class Objective:
+    """Wrapper around objective function that counts the number of evaluations"""
+
+    def __init__(self, func: ty.Callable[[np.ndarray], float]):
+        self.func = func
+        self.n_evaluations = 0
+
+    def __call__(self, x: np.ndarray) -> float:
+        self.n_evaluations += 1
+        return self.func(x)
+
+
+def nelder_mead(
+    func: ty.Callable, x0: np.ndarray, bounds: np.ndarray, xtol: np.ndarray, max_evaluations: int = 500
+) -> ty.Tuple[np.ndarray, int]:
+    """Minimize function using the Nelder-Mead simplex method
+
+    Vertices of the simplex are clipped to the bounds so the function is never evaluated outside of them.
+
+    Parameters
+    ----------
+    func : Callable
+        function to be minimized
+    x0 : np.ndarray
+        1D array with the starting point (D)
+    bounds : np.ndarray
+        2D array with the lower and upper bound of each parameter (D x 2)
+    xtol : np.ndarray
+        1D array with the absolute tolerance of each parameter (D)
+    max_evaluations : int
+        maximum number of function evaluations
+
+    Returns
+    -------
+    x_opt : np.ndarray
+        1D array with the optimal parameters (D)
+    n_evaluations : int
+        number of function evaluations
+    """
+    func = Objective(func)
+    n_dim = x0.shape[0]
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    # initial simplex spans a quarter of the bounds in each direction
+    step = 0.25 * (upper - lower)
+    simplex = np.tile(np.clip(x0, lower, upper), (n_dim + 1, 1))
+    for i in range(n_dim):
+        simplex[i + 1, i] += step[i] if simplex[i + 1, i] + step[i] <= upper[i] else -step[i]
+    values = np.array([func(vertex) for vertex in simplex])
+
+    while func.n_evaluations < max_evaluations:
+        order = np.argsort(values, kind="mergesort")
+        simplex, values = simplex[order], values[order]
+        if np.all(np.abs(simplex[1:] - simplex[0]).max(axis=0) <= xtol):
+            break
+
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = np.clip(2 * centroid - simplex[-1], lower, upper)
+        value_reflected = func(reflected)
+        if value_reflected < values[0]:
+            expanded = np.clip(3 * centroid - 2 * simplex[-1], lower, upper)
+            value_expanded = func(expanded)
+            if value_expanded < value_reflected:
+                simplex[-1], values[-1] = expanded, value_expanded
+            else:
+                simplex[-1], values[-1] = reflected, value_reflected
+        elif value_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, value_reflected
+        else:
+            contracted = 0.5 * (centroid + (reflected if value_reflected < values[-1] else simplex[-1]))
+            value_contracted = func(contracted)
+            if value_contracted < min(value_reflected, values[-1]):
+                simplex[-1], values[-1] = contracted, value_contracted
+            else:
+                # shrink towards the best vertex
+                simplex[1:] = 0.5 * (simplex[0] + simplex[1:])
+                values[1:] = [func(vertex) for vertex in simplex[1:]]
+    i_min = values.argmin()
+    return simplex[i_min], func.n_evaluations
+
+
+def brent(
+    func: ty.Callable,
+    x0: np.ndarray,
+    bounds: np.ndarray,
+    xtol: np.ndarray,
+    max_evaluations: int = 500,
+    step: ty.Optional[np.ndarray] = None,
+) -> ty.Tuple[np.ndarray, int]:
+    """Minimize function using coordinate-wise bounded Brent method
+
+    Each parameter is optimized in turn while the others are kept fixed. The cycle is repeated until none of the
+    parameters changes by more than its tolerance. Brent method searches the whole interval it is given, so each
+    parameter is only searched within `step` of its current value (clipped to the bounds) to stay in the basin of
+    the starting point. Parameters and return values are the same as in `nelder_mead`.
+
+    Parameters
+    ----------
+    step : np.ndarray, optional
+        1D array with the half-width of the interval searched in each dimension (D). Default: the whole bounds
+    """
+    # scipy is imported on first use as it accounts for most of the import time of the package
+    from scipy.optimize import minimize_scalar
+
+    func = Objective(func)
+    x_opt = np.clip(x0, bounds[:, 0], bounds[:, 1]).astype(np.float64)
+
+    def _func(value: float, dim: int) -> float:
+        x = x_opt.copy()
+        x[dim] = value
+        return func(x)
+
+    while func.n_evaluations < max_evaluations:
+        x_previous = x_opt.copy()
+        for dim in range(x_opt.shape[0]):
+            lower, upper = bounds[dim]
+            if step is not None:
+                lower, upper = max(lower, x_opt[dim] - step[dim]), min(upper, x_opt[dim] + step[dim])
+            if upper <= lower:
+                continue
+            result = minimize_scalar(
+                _func, bounds=(lower, upper), args=(dim,), method="bounded", options={"xatol": xtol[dim]}
+            )
+            x_opt[dim] = result.x
+        if np.all(np.abs(x_opt - x_previous) <= xtol):
+            break
+    return x_opt, func.n_evaluations
+
+
+def pattern_search(
+    func: ty.Callable, x0: np.ndarray, bounds: np.ndarray, xtol: np.ndarray, max_evaluations: int = 500
+) -> ty.Tuple[np.ndarray, int]:
+    """Minimize function using bounded compass (pattern) search
+
+    The current point is moved along the first coordinate direction that improves the function value. If none of the
+    directions improves it, the step is halved. The search stops once the step in every direction is below the
+    tolerance. Parameters and return values are the same as in `nelder_mead`.
+    """
+    func = Objective(func)
+    lower, upper = bounds[:, 0], bounds[:, 1]
+    step = 0.25 * (upper - lower)
+    x_opt = np.clip(x0, lower, upper).astype(np.float64)
+    value_opt = func(x_opt)
+
+    while np.any(step > xtol) and func.n_evaluations < max_evaluations:
+        improved = False
+        for dim in range(x_opt.shape[0]):
+            for direction in (1, -1):
+                x = x_opt.copy()
+                x[dim] = np.clip(x[dim] + direction * step[dim], lower[dim], upper[dim])
+                if x[dim] == x_opt[dim]:
+                    continue
+                value = func(x)
+                if value < value_opt:
+                    x_opt, value_opt, improved = x, value, True
+                    break
+        if not improved:
+            step = step / 2
+    return x_opt, func.n_evaluations
+
+
+OPTIMIZER_FUNCS = {"nelder-mead": nelder_mead, "brent": brent, "pattern": pattern_search}
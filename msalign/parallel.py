@@ -0,0 +1,482 @@
+"""Parallel execution of the alignment procedure"""
+import math
+import mmap
+import numbers
+import os
+import typing as ty
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+
+import numpy as np
+
+from .utilities import ProgressTracker
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - Python 3.7
+    shared_memory = None
+
+if ty.TYPE_CHECKING:
+    from .align import Aligner
+
+BACKENDS = ["process", "thread"]
+
+# state of the worker process - set once by the pool initializer so arrays are not sent with every task
+_WORKER_STATE: ty.Dict[str, ty.Any] = {}
+
+
+def get_n_jobs(n_jobs: ty.Optional[int]) -> int:
+    """Convert `n_jobs` to the actual number of workers
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        number of workers. Negative values are counted from the number of available cores so that '-1' uses all
+        cores, '-2' uses all but one, etc.
+
+    Returns
+    -------
+    n_jobs : int
+        number of workers
+    """
+    if n_jobs is None:
+        return 1
+    # numpy integers (e.g. values read from configuration arrays) are accepted as well
+    if not isinstance(n_jobs, numbers.Integral) or n_jobs == 0:
+        raise ValueError("Value of 'n_jobs' must be a non-zero integer!")
+    n_jobs = int(n_jobs)
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def get_tasks(n_signals: int, chunk_size: int, n_jobs: int, multiple: int = 1) -> ty.List[ty.Tuple[int, int]]:
+    """Split signals into contiguous blocks of (start, stop) indices so that each worker receives several tasks
+
+    The size of the blocks is rounded up to a multiple of `multiple`, e.g. so that they start at the anchors of the
+    warm start.
+    """
+    task_size = max(1, min(chunk_size, math.ceil(n_signals / (4 * n_jobs))))
+    task_size = math.ceil(task_size / multiple) * multiple
+    return [(start, min(start + task_size, n_signals)) for start in range(0, n_signals, task_size)]
+
+
+def _get_task_size(task_size: int, progress: ty.Optional[ProgressTracker]) -> int:
+    """Limit the size of the tasks so that the progress can be reported every `progress.every` signals"""
+    if progress is None:
+        return task_size
+    return min(task_size, progress.every)
+
+
+class SharedArray:
+    """Numpy array that is backed by shared memory
+
+    Parameters
+    ----------
+    shape : tuple
+        shape of the array
+    dtype : str
+        data type of the array
+    name : str, optional
+        name of existing shared memory block. If not specified, new block will be created
+    """
+
+    def __init__(self, shape: ty.Tuple[int, ...], dtype: str, name: ty.Optional[str] = None):
+        if shared_memory is None:  # pragma: no cover
+            raise RuntimeError("Shared memory is not available in this version of Python.")
+        dtype = np.dtype(dtype)
+        n_bytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=n_bytes)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SharedArray":
+        """Create shared array and copy data from `array`"""
+        shared = cls(array.shape, array.dtype.str)
+        shared.array[:] = array
+        return shared
+
+    @property
+    def spec(self) -> ty.Tuple[str, ty.Dict[str, ty.Any]]:
+        """Specification that can be used to attach to the shared memory block in another process"""
+        return "shared", {"shape": self.array.shape, "dtype": self.array.dtype.str, "name": self._shm.name}
+
+    def close(self):
+        """Release the shared memory block"""
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class MappedArray:
+    """Numpy array that is backed by a memory-mapped file
+
+    Memory-mapped arrays are shared with other processes by re-opening the file rather than copying the data.
+
+    Parameters
+    ----------
+    filename : str
+        path to the memory-mapped file
+    shape : tuple
+        shape of the array
+    dtype : str
+        data type of the array
+    offset : int
+        offset (in bytes) of the first element of the array in the file
+    mode : str
+        mode in which the file is opened
+    """
+
+    def __init__(self, filename: str, shape: ty.Tuple[int, ...], dtype: str, offset: int, mode: str):
+        self.array = np.memmap(filename, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+    @classmethod
+    def from_memmap(cls, array: np.memmap) -> "MappedArray":
+        """Wrap existing memory-mapped array"""
+        mapped = cls.__new__(cls)
+        mapped.array = array
+        return mapped
+
+    @staticmethod
+    def get_offset(array: np.ndarray) -> ty.Optional[int]:
+        """Get offset (in bytes) of the array in the memory-mapped file or `None` if it cannot be shared"""
+        buffer = getattr(array, "_mmap", None)
+        if not isinstance(array, np.memmap) or buffer is None or array.filename is None:
+            return None
+        if array.mode == "c" or not array.flags.c_contiguous:
+            return None
+        # the file is mapped from a multiple of the allocation granularity
+        start = np.frombuffer(buffer, dtype=np.uint8).ctypes.data
+        return array.offset - array.offset % mmap.ALLOCATIONGRANULARITY + array.ctypes.data - start
+
+    @property
+    def spec(self) -> ty.Tuple[str, ty.Dict[str, ty.Any]]:
+        """Specification that can be used to open the file in another process"""
+        return "mapped", {
+            "filename": self.array.filename,
+            "shape": self.array.shape,
+            "dtype": self.array.dtype.str,
+            "offset": self.get_offset(self.array),
+            "mode": "r" if self.array.mode == "r" else "r+",
+        }
+
+    def close(self):
+        """Flush changes to the disk"""
+        if self.array.mode != "r":
+            self.array.flush()
+        self.array = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def share_array(array: np.ndarray, copy: bool = True) -> ty.Union[SharedArray, MappedArray]:
+    """Share array with other processes
+
+    Memory-mapped arrays are shared by re-opening the file in the other process, all other arrays are placed in shared
+    memory.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        array to be shared
+    copy : bool, optional
+        if 'True', the data is copied to the shared memory. Otherwise, the shared memory is left uninitialized
+
+    Returns
+    -------
+    shared : Union[SharedArray, MappedArray]
+        shared array
+    """
+    if MappedArray.get_offset(array) is not None:
+        return MappedArray.from_memmap(array)
+    if copy:
+        return SharedArray.from_array(array)
+    return SharedArray(array.shape, array.dtype.str)
+
+
+def _attach(spec: ty.Tuple[str, ty.Dict[str, ty.Any]]) -> ty.Union[SharedArray, MappedArray]:
+    """Attach to array that was shared by another process"""
+    kind, kwargs = spec
+    if kind == "mapped":
+        return MappedArray(**kwargs)
+    return SharedArray(**kwargs)
+
+
+def _init_worker(aligner: "Aligner", specs: ty.Dict[str, ty.Tuple]):
+    """Initialize worker process by attaching to the shared arrays"""
+    _WORKER_STATE["aligner"] = aligner
+    _WORKER_STATE["arrays"] = {key: _attach(spec) for key, spec in specs.items()}
+
+
+def _compute_task(start: int, stop: int, warm_start: int = 0):
+    """Compute correction factors for signals between `start` and `stop`"""
+    aligner, arrays = _WORKER_STATE["aligner"], _WORKER_STATE["arrays"]
+    shift_opt, scale_opt, info = _compute_block(aligner, arrays["array"].array, start, stop, warm_start)
+    arrays["shift"].array[start:stop] = shift_opt
+    arrays["scale"].array[start:stop] = scale_opt
+    for key, values in info.items():
+        arrays[key].array[start:stop] = values
+
+
+def _compute_block(
+    aligner: "Aligner", array: np.ndarray, start: int, stop: int, warm_start: int
+) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+    """Compute correction factors for signals between `start` and `stop` of the full `array`
+
+    Warm-started signals are seeded by the anchors around them (which can be outside of the block) so the whole
+    array is passed to the aligner.
+    """
+    if warm_start:
+        return aligner._compute_warm_start(array, warm_start, start=start, stop=stop)
+    return aligner.compute_batch(array[start:stop], return_info=True)
+
+
+def _align_task(start: int, stop: int):
+    """Apply correction factors to signals between `start` and `stop`"""
+    aligner, arrays = _WORKER_STATE["aligner"], _WORKER_STATE["arrays"]
+    array, out = arrays["array"].array, arrays["out"].array
+    shift_opt, scale_opt = arrays["shift"].array, arrays["scale"].array
+    for i in range(start, stop):
+        out[i] = aligner._apply(array[i], shift_opt[i], scale_opt[i])
+    if isinstance(out, np.memmap):
+        out.flush()
+
+
+def _wait(futures: ty.List[Future], tasks: ty.List[ty.Tuple[int, int]], progress: ty.Optional[ProgressTracker]):
+    """Wait for the tasks in the order they were submitted and report the progress
+
+    If the operation is cancelled, tasks that have not started yet are cancelled as well. The tasks that are already
+    running are completed and `progress.n_done` is set to the number of signals that were processed so the results of
+    the first `progress.n_done` signals are always complete.
+    """
+    for future, (_, stop) in zip(futures, tasks):
+        future.result()
+        if progress is not None and progress.update(stop):
+            _cancel(futures, tasks, progress)
+            return
+
+
+def _cancel(futures: ty.List[Future], tasks: ty.List[ty.Tuple[int, int]], progress: ProgressTracker):
+    """Cancel tasks that have not started yet and wait for the ones that are running"""
+    # tasks are started in order so they are cancelled from the end to make sure that the started tasks are contiguous
+    for pending in reversed(futures):
+        pending.cancel()
+    for future, (_, stop) in zip(futures, tasks):
+        if future.cancelled():
+            break
+        future.result()
+        progress.n_done = max(progress.n_done, stop)
+
+
+def _execute_threads(
+    func: ty.Callable,
+    tasks: ty.List[ty.Tuple[int, int]],
+    n_jobs: int,
+    progress: ty.Optional[ProgressTracker] = None,
+):
+    """Execute tasks in a thread pool
+
+    Tasks operate on non-overlapping blocks of the (shared) arrays and most of the work is done by NumPy/SciPy which
+    release the GIL so threads do not need to synchronize. The same holds for the free-threaded builds of Python.
+    """
+    with ThreadPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+        _wait([executor.submit(func, start, stop) for start, stop in tasks], tasks, progress)
+
+
+def _execute(
+    func: ty.Callable,
+    tasks: ty.List[ty.Tuple[int, int]],
+    n_jobs: int,
+    aligner: "Aligner",
+    specs: ty.Dict,
+    progress: ty.Optional[ProgressTracker] = None,
+):
+    """Execute tasks in a process pool"""
+    # the process pool (and `multiprocessing`) is imported on first use to keep the import of the package quick
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=min(n_jobs, len(tasks)), initializer=_init_worker, initargs=(aligner, specs)
+    ) as executor:
+        _wait([executor.submit(func, start, stop) for start, stop in tasks], tasks, progress)
+
+
+def compute_parallel(
+    aligner: "Aligner",
+    array: np.ndarray,
+    n_jobs: int,
+    backend: str = "process",
+    warm_start: int = 0,
+    progress: ty.Optional[ProgressTracker] = None,
+) -> ty.Tuple[np.ndarray, np.ndarray, ty.Dict[str, np.ndarray]]:
+    """Compute correction factors for each signal in `array` using a pool of processes or threads
+
+    Parameters
+    ----------
+    aligner : Aligner
+        aligner instance with the alignment parameters
+    array : np.ndarray
+        2D array of intensities (M x N)
+    n_jobs : int
+        number of workers
+    backend : str, optional
+        either 'process' or 'thread'
+    warm_start : int, optional
+        spacing of the signals computed using the full search range - see `Aligner.run`
+    progress : ProgressTracker, optional
+        progress tracker that is updated once the tasks are completed (in order). Tasks contain at most
+        `progress.every` signals (rounded up to a multiple of `warm_start`). If the operation is cancelled, only the
+        first `progress.n_done` signals are computed
+
+    Returns
+    -------
+    shift_opt : np.ndarray
+        1D array of optimized shift values (M)
+    scale_opt : np.ndarray
+        1D array of optimized scale values (M)
+    info : dict
+        dictionary of 1D arrays (M) with information about the optimization (e.g. number of objective evaluations)
+    """
+    n_signals = array.shape[0]
+    # warm-started tasks start at the anchors so the results are the same as when the signals are computed serially
+    tasks = get_tasks(n_signals, _get_task_size(aligner.chunk_size, progress), n_jobs, max(1, warm_start))
+    if backend == "thread":
+        shift_opt, scale_opt = np.zeros(n_signals), np.ones(n_signals)
+        info = {key: np.zeros(n_signals, dtype=dtype) for key, dtype in aligner._info_fields.items()}
+
+        def _task(start: int, stop: int):
+            shift_opt[start:stop], scale_opt[start:stop], chunk_info = _compute_block(
+                aligner, array, start, stop, warm_start
+            )
+            for key, values in chunk_info.items():
+                info[key][start:stop] = values
+
+        _execute_threads(_task, tasks, n_jobs, progress)
+        return shift_opt, scale_opt, info
+
+    with ExitStack() as stack:
+        data = stack.enter_context(share_array(array))
+        shift_opt = stack.enter_context(SharedArray((n_signals,), "<f8"))
+        scale_opt = stack.enter_context(SharedArray((n_signals,), "<f8"))
+        info = {
+            key: stack.enter_context(SharedArray((n_signals,), np.dtype(dtype).str))
+            for key, dtype in aligner._info_fields.items()
+        }
+        specs = {"array": data.spec, "shift": shift_opt.spec, "scale": scale_opt.spec}
+        specs.update({key: shared.spec for key, shared in info.items()})
+        _execute(partial(_compute_task, warm_start=warm_start), tasks, n_jobs, aligner._detached(), specs, progress)
+        return (
+            shift_opt.array.copy(),
+            scale_opt.array.copy(),
+            {key: shared.array.copy() for key, shared in info.items()},
+        )
+
+
+def align_parallel(
+    aligner: "Aligner",
+    array: np.ndarray,
+    out: np.ndarray,
+    shift_opt: np.ndarray,
+    scale_opt: np.ndarray,
+    n_jobs: int,
+    backend: str = "process",
+    progress: ty.Optional[ProgressTracker] = None,
+):
+    """Apply correction factors to each signal in `array` using a pool of processes or threads and write them to `out`
+
+    Parameters
+    ----------
+    aligner : Aligner
+        aligner instance with the alignment parameters
+    array : np.ndarray
+        2D array of intensities (M x N)
+    out : np.ndarray
+        2D array where the aligned signals are written (M x N)
+    shift_opt : np.ndarray
+        vector containing values by which to shift the array
+    scale_opt : np.ndarray
+        vector containing values by which to rescale the array
+    n_jobs : int
+        number of workers
+    backend : str, optional
+        either 'process' or 'thread'
+    progress : ProgressTracker, optional
+        progress tracker that is updated once the tasks are completed (in order) - see `compute_parallel`
+    """
+    n_signals = array.shape[0]
+    tasks = get_tasks(n_signals, _get_task_size(n_signals, progress), n_jobs)
+    if backend == "thread":
+
+        def _task(start: int, stop: int):
+            for i in range(start, stop):
+                out[i] = aligner._apply(array[i], shift_opt[i], scale_opt[i])
+
+        _execute_threads(_task, tasks, n_jobs, progress)
+        return
+
+    with ExitStack() as stack:
+        data = stack.enter_context(share_array(array))
+        # signals that are aligned in-place are read and written by the workers in the same shared block so only one
+        # copy of the data is created
+        result = data if out is array else stack.enter_context(share_array(out, copy=False))
+        shift_values = stack.enter_context(
+            SharedArray.from_array(np.asarray(shift_opt, dtype=np.float64).reshape(n_signals))
+        )
+        scales = stack.enter_context(SharedArray.from_array(np.asarray(scale_opt, dtype=np.float64).reshape(n_signals)))
+        specs = {"array": data.spec, "out": result.spec, "shift": shift_values.spec, "scale": scales.spec}
+        _execute(_align_task, tasks, n_jobs, aligner._detached(), specs, progress)
+        # memory-mapped output is written directly by the workers. Otherwise, only the signals that were aligned are
+        # copied back so that the remaining rows of `out` are left unchanged if the operation was cancelled
+        if result.array is not out:
+            n_done = n_signals if progress is None else progress.n_done
+            out[:n_done] = result.array[:n_done]
+
+
+def shift_parallel(
+    aligner: "Aligner",
+    array: np.ndarray,
+    out: np.ndarray,
+    shift_opt: np.ndarray,
+    n_jobs: int,
+    progress: ty.Optional[ProgressTracker] = None,
+):
+    """Shift each signal in `array` using a pool of threads and write them to `out`
+
+    Shifting is limited by memory bandwidth so it is always executed in threads as the cost of transferring the data
+    to other processes would outweigh any gains.
+
+    Parameters
+    ----------
+    aligner : Aligner
+        aligner instance with the alignment parameters
+    array : np.ndarray
+        2D array of intensities (M x N)
+    out : np.ndarray
+        2D array where the shifted signals are written (M x N)
+    shift_opt : np.ndarray
+        vector containing integer values by which to shift the array
+    n_jobs : int
+        number of workers
+    progress : ProgressTracker, optional
+        progress tracker that is updated once the tasks are completed (in order) - see `compute_parallel`
+    """
+    n_signals = array.shape[0]
+
+    def _task(start: int, stop: int):
+        aligner._shift_block(array[start:stop], out[start:stop], shift_opt[start:stop])
+
+    tasks = get_tasks(n_signals, _get_task_size(n_signals, progress), n_jobs)
+    _execute_threads(_task, tasks, n_jobs, progress)
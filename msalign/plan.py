@@ -0,0 +1,138 @@
+"""Data-independent part of the alignment procedure that can be shared by many aligners"""
+import typing as ty
+from functools import lru_cache
+
+import numpy as np
+
+# maximum number of alignment plans kept in the cache
+PLAN_CACHE_SIZE = 128
+
+
+class AlignmentPlan:
+    """Immutable alignment plan with the synthetic signal and the search grid
+
+    The plan depends only on the alignment parameters (and not on the signals) so it can be shared by any number of
+    `Aligner` instances. Use `get_plan` to obtain (cached) plan rather than creating it directly.
+    """
+
+    __slots__ = (
+        "_key",
+        "corr_sig_x",
+        "corr_sig_y",
+        "corr_sig_l",
+        "reduce_range_factor",
+        "scale_range",
+        "search_space",
+        "support_edges",
+    )
+
+    def __init__(
+        self,
+        peaks: ty.Tuple[float, ...],
+        weights: ty.Tuple[float, ...],
+        width: float,
+        ratio: float,
+        resolution: int,
+        grid_steps: int,
+        shift_range: ty.Tuple[float, float],
+        only_shift: bool,
+    ):
+        _set = super().__setattr__
+        _set("_key", (peaks, weights, width, ratio, resolution, grid_steps, shift_range, only_shift))
+        n_peaks = len(peaks)
+        shift_range = np.asarray(shift_range)
+
+        # set the synthetic target signal
+        corr_sig_x = np.zeros((resolution + 1, n_peaks))
+        corr_sig_y = np.zeros((resolution + 1, n_peaks))
+        resolution_range = np.arange(0, resolution + 1)
+        for i in range(n_peaks):
+            left_l = peaks[i] - ratio * width
+            right_l = peaks[i] + ratio * width
+            corr_sig_x[:, i] = left_l + (resolution_range * (right_l - left_l) / resolution)
+            corr_sig_y[:, i] = weights[i] * np.exp(-np.square((corr_sig_x[:, i] - peaks[i]) / width))
+        _set("corr_sig_l", (resolution + 1) * n_peaks)
+        _set("corr_sig_x", corr_sig_x.flatten("F"))
+        _set("corr_sig_y", corr_sig_y.flatten("F"))
+
+        # set reduce_range_factor to take 5 points of the previous ranges or half of
+        # the previous range if grid_steps < 10
+        _set("reduce_range_factor", min(0.5, 5 / grid_steps))
+
+        # set scl such that the maximum peak can shift no more than the limits imposed by shift when scaling
+        _set("scale_range", np.array([1, 1]) if only_shift else 1 + shift_range / max(peaks))
+
+        # create the mesh-grid only once
+        mesh_a, mesh_b = np.meshgrid(
+            np.divide(np.arange(0, grid_steps), grid_steps - 1), np.divide(np.arange(0, grid_steps), grid_steps - 1)
+        )
+        _set("search_space", np.vstack([mesh_a.flatten(order="F"), mesh_b.flatten(order="F")]).T)
+
+        # at each iteration the search range is centered on the current optimum so it can extend beyond the previous
+        # range by half of its width - the sum of these extensions gives the maximum extension of the initial range
+        extension = self.reduce_range_factor / (2 * (1 - self.reduce_range_factor))
+        scale_range = np.sort(self.scale_range) + np.array([-1, 1]) * np.ptp(self.scale_range) * extension
+        shift_range = np.sort(shift_range) + np.array([-1, 1]) * np.ptp(shift_range) * extension
+
+        # edges of the window around each peak at the extremes of the scale and shift values that can be sampled
+        # during the grid search
+        corr_sig_x = np.reshape(self.corr_sig_x, (n_peaks, -1))
+        edges = np.stack([corr_sig_x.min(axis=1), corr_sig_x.max(axis=1)], axis=1)
+        edges = edges[:, :, np.newaxis] * scale_range
+        _set(
+            "support_edges",
+            np.stack([edges.min(axis=(1, 2)) + shift_range[0], edges.max(axis=(1, 2)) + shift_range[1]]),
+        )
+
+        # these arrays are shared by all aligners (potentially from multiple threads) so prevent accidental
+        # modification
+        for array in (self.corr_sig_x, self.corr_sig_y, self.scale_range, self.search_space, self.support_edges):
+            array.setflags(write=False)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("AlignmentPlan is immutable")
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, AlignmentPlan) and self._key == other._key
+
+    def __reduce__(self):
+        return _get_plan, self._key
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<peaks={self._key[0]}; grid_steps={self._key[5]}>"
+
+
+def get_plan(
+    peaks: ty.Iterable[float],
+    weights: ty.Iterable[float],
+    width: float,
+    ratio: float,
+    resolution: int,
+    grid_steps: int,
+    shift_range: ty.Iterable[float],
+    only_shift: bool,
+) -> AlignmentPlan:
+    """Get alignment plan for the specified parameters
+
+    Plans are kept in a bounded LRU cache (see `PLAN_CACHE_SIZE`) so creating many aligners with the same parameters
+    does not recompute the synthetic signal and the search grid.
+    """
+    return _get_plan(
+        tuple(float(peak) for peak in peaks),
+        tuple(float(weight) for weight in np.ravel(weights)),
+        float(width),
+        float(ratio),
+        int(resolution),
+        int(grid_steps),
+        tuple(float(value) for value in shift_range),
+        bool(only_shift),
+    )
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _get_plan(*key) -> AlignmentPlan:
+    """Create alignment plan - cached version"""
+    return AlignmentPlan(*key)
@@ -1,10 +1,11 @@
 """Various utilities used by the library"""
+import threading
 import time
 import warnings
-from typing import List, Union
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional, Union
 
 import numpy as np
-import scipy.interpolate as interpolate
 
 
 def format_time(value: float) -> str:
@@ -49,10 +50,111 @@ def time_loop(t_start: float, n_item: int, n_total: int, as_percentage: bool = T
     progress = f"{n_item}/{n_total + 1}"
     if as_percentage:
         progress = f"{(n_item / (n_total + 1)) * 100:.1f}%"
+    return format_progress(t_avg, t_rem, t_tot, progress)
 
+
+def format_progress(t_avg: float, t_rem: float, t_tot: float, progress: str) -> str:
+    """Format average, remaining and total times together with the progress"""
     return f"[Avg: {format_time(t_avg)} | Rem: {format_time(t_rem)} | Tot: {format_time(t_tot)} || {progress}]"
 
 
+class Progress(NamedTuple):
+    """Progress of a long-running operation that is passed to the progress callbacks
+
+    Items are processed in order so the first `n_done` items are complete.
+
+    Parameters
+    ----------
+    stage : str
+        name of the operation, e.g. 'run', 'align' or 'shift'
+    n_done : int
+        number of items that were processed
+    n_total : int
+        total number of items
+    elapsed : float
+        time (in seconds) since the start of the operation
+    cancelled : bool
+        whether the operation was cancelled
+    """
+
+    stage: str
+    n_done: int
+    n_total: int
+    elapsed: float
+    cancelled: bool = False
+
+    @property
+    def throughput(self) -> float:
+        """Number of items processed per second"""
+        return self.n_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Estimated time (in seconds) until the operation is complete"""
+        if self.n_done >= self.n_total:
+            return 0.0
+        return (self.n_total - self.n_done) / self.throughput if self.throughput > 0 else float("inf")
+
+    def __str__(self):
+        t_avg = self.elapsed / self.n_done if self.n_done else 0.0
+        progress = f"{(self.n_done / self.n_total if self.n_total else 1) * 100:.1f}%"
+        return f"{self.stage} {self.n_done}/{self.n_total} " + format_progress(t_avg, self.eta, self.elapsed, progress)
+
+
+class ProgressTracker:
+    """Track progress of an operation, invoke the callback every `every` items and check for cancellation
+
+    Parameters
+    ----------
+    stage : str
+        name of the operation
+    n_total : int
+        total number of items
+    callback : Callable, optional
+        function that is called with `Progress` every `every` items (and once all items are processed). If it returns
+        `True`, the operation is cancelled
+    every : int, optional
+        number of items between the calls of `callback`
+    is_cancelled : Callable, optional
+        function that returns `True` if the operation was cancelled elsewhere (e.g. from another thread)
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        n_total: int,
+        callback: Optional[Callable[[Progress], Optional[bool]]] = None,
+        every: int = 1,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ):
+        self.stage = stage
+        self.n_total = n_total
+        self.callback = callback
+        self.every = every
+        self.is_cancelled = is_cancelled
+        self.n_done = 0
+        self.cancelled = False
+        self._n_reported = 0
+        self._t_start = time.perf_counter()
+
+    @property
+    def progress(self) -> Progress:
+        """Current progress"""
+        return Progress(self.stage, self.n_done, self.n_total, time.perf_counter() - self._t_start, self.cancelled)
+
+    def update(self, n_done: int) -> bool:
+        """Set number of processed items and return `True` if the operation should be cancelled"""
+        self.n_done = n_done
+        if self.callback is not None and (n_done - self._n_reported >= self.every or n_done >= self.n_total):
+            self._n_reported = n_done
+            if self.callback(self.progress):
+                self.cancelled = True
+        # checked after the callback so it can also cancel the operation by other means
+        if self.is_cancelled is not None and self.is_cancelled():
+            self.cancelled = True
+        return self.cancelled
+
+
 def shift(array, num, fill_value=0):
     """Shift 1d array to new position with 0 padding to prevent wraparound - this function is actually
     quicker than np.roll
@@ -81,6 +183,52 @@ def shift(array, num, fill_value=0):
     return result
 
 
+def shift_rows(array, nums, fill_value=0, out=None):
+    """Shift each row of 2d array by its own value with padding to prevent wraparound
+
+    Consecutive rows that share the same shift value are moved together using strided copies directly into the
+    (preallocated) output array so no intermediate arrays are created.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        2D array to be shifted (M x N)
+    nums : np.ndarray
+        1D array of integer values by which each row should be shifted (M)
+    fill_value : Union[float, int]
+        value to fill in the areas where wraparound would have happened
+    out : np.ndarray, optional
+        2D array where the shifted rows are written (M x N). Can be the same as `array`
+
+    Returns
+    -------
+    out : np.ndarray
+        shifted array
+    """
+    nums = np.asarray(nums).reshape(-1)
+    if not np.issubdtype(nums.dtype, np.integer):
+        raise ValueError("`nums` must be integers")
+    if nums.shape[0] != array.shape[0]:
+        raise ValueError("Number of shift values does not match the number of rows.")
+    if out is None:
+        out = np.empty_like(array)
+
+    # find blocks of rows with the same shift value
+    boundaries = np.flatnonzero(np.diff(nums)) + 1
+    for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, nums.shape[0]]):
+        num = int(nums[start])
+        # values are moved before filling in case the array is shifted in-place
+        if num > 0:
+            out[start:stop, num:] = array[start:stop, :-num]
+            out[start:stop, :num] = fill_value
+        elif num < 0:
+            out[start:stop, :num] = array[start:stop, -num:]
+            out[start:stop, num:] = fill_value
+        elif out is not array:
+            out[start:stop] = array[start:stop]
+    return out
+
+
 def check_xy(x, array):
     """
     Check zvals input
@@ -108,7 +256,37 @@ def check_xy(x, array):
     return array
 
 
-def generate_function(method, x, y):
+class LinearInterpolator:
+    """Linear interpolator that is built on sorted-axis lookups rather than `scipy.interpolate.interp1d`
+
+    The interpolator gives the same results as `interp1d(x, y, "linear", bounds_error=False, fill_value=0)` but
+    does not copy the data and has a much lower construction and call overhead.
+
+    Parameters
+    ----------
+    x : np.array
+        1D array of separation units (N)
+    y : np.ndarray
+        1D array of intensity values (N)
+    assume_sorted : bool, optional
+        if 'False', the values of `x` can be in any order and they will be sorted first
+    fill_value : float, optional
+        value returned for points outside of the range of `x`
+    """
+
+    def __init__(self, x, y, assume_sorted: bool = False, fill_value: float = 0):
+        x, y = np.asarray(x), np.asarray(y)
+        if not assume_sorted:
+            index = np.argsort(x, kind="mergesort")
+            x, y = x[index], y[index]
+        self.x, self.y = x, y
+        self.fill_value = fill_value
+
+    def __call__(self, x_new):
+        return np.interp(x_new, self.x, self.y, left=self.fill_value, right=self.fill_value)
+
+
+def generate_function(method, x, y, engine: str = "auto", assume_sorted: bool = False):
     """
     Generate interpolation function
 
@@ -119,18 +297,215 @@ def generate_function(method, x, y):
     x : np.array
         1D array of separation units (N)
     y : np.ndarray
-        1D array of intensity values (N)
+        1D array of intensity values (N) or 2D array of intensities of several signals (M x N) which are interpolated
+        together (only supported by the 'scipy' engine)
+    engine : str, optional
+        interpolation engine. Either 'scipy', 'numpy' or 'auto'. The 'numpy' engine is only available for 'linear'
+        interpolation and is used by default ('auto') for that method.
+    assume_sorted : bool, optional
+        if 'False', the values of `x` can be in any order and they will be sorted first. Only used by the 'numpy'
+        engine.
 
     Returns
     -------
     fcn : scipy interpolator
         interpolation function
     """
+    if engine not in ["auto", "scipy", "numpy"]:
+        raise ValueError(f"Engine `{engine}` not found in the engine options: ['auto', 'scipy', 'numpy']")
+    if engine == "numpy" and method != "linear":
+        raise ValueError("The 'numpy' engine is only available for 'linear' interpolation.")
+    if method == "linear" and engine != "scipy":
+        return LinearInterpolator(x, y, assume_sorted=assume_sorted)
+    # scipy is imported on first use as it accounts for most of the import time of the package
+    from scipy import interpolate
+
     if method == "pchip":
-        return interpolate.PchipInterpolator(x, y, extrapolate=False)
+        return interpolate.PchipInterpolator(x, y, axis=-1, extrapolate=False)
     return interpolate.interp1d(x, y, method, bounds_error=False, fill_value=0)
 
 
+def interpolation_operator(x, points, weights):
+    """
+    Generate sparse linear interpolation operator
+
+    The operator `A` is built such that `A @ y` is equal to the weighted sum of the values of `y` linearly
+    interpolated at each row of `points`, i.e. `(np.interp(points, x, y, left=0, right=0) * weights).sum(axis=1)`.
+    Since the operator does not depend on `y`, it can be applied to many signals that share the same `x` at once.
+
+    Parameters
+    ----------
+    x : np.array
+        1D array of sorted separation units (N)
+    points : np.ndarray
+        2D array of points at which signals are interpolated (K x L)
+    weights : np.ndarray
+        1D array of weights of each interpolated point (L)
+
+    Returns
+    -------
+    operator : scipy.sparse.csr_matrix
+        sparse interpolation operator (K x N)
+    """
+    n_rows, n_points = points.shape
+    # fractional position of each point in `x` - `np.interp` is used as it is much quicker than `np.searchsorted`
+    position = np.interp(points, x, np.arange(x.shape[0], dtype=np.float64), left=-1, right=-1)
+    index = np.clip(position.astype(np.intp), 0, x.shape[0] - 2)
+    ratio = position - index
+    weights = np.where(position >= 0, weights, 0)
+    # each interpolated point contributes to the two neighbouring values of the signal
+    data = np.empty((n_rows, n_points, 2))
+    np.multiply(weights, 1 - ratio, out=data[..., 0])
+    np.multiply(weights, ratio, out=data[..., 1])
+    indices = np.empty((n_rows, n_points, 2), dtype=np.intp)
+    indices[..., 0] = index
+    np.add(index, 1, out=indices[..., 1])
+    indptr = np.arange(n_rows + 1) * 2 * n_points
+    from scipy import sparse
+
+    return sparse.csr_matrix((data.reshape(-1), indices.reshape(-1), indptr), shape=(n_rows, x.shape[0]))
+
+
+def bin_signal(array, factor: int):
+    """
+    Reduce the number of points along the last axis of `array` by averaging `factor` consecutive points
+
+    Parameters
+    ----------
+    array : np.ndarray
+        1D or 2D array (e.g. separation units or intensities)
+    factor : int
+        number of consecutive points in each bin. The last bin can contain fewer points
+
+    Returns
+    -------
+    binned : np.ndarray
+        array with `ceil(N / factor)` points along the last axis
+    """
+    array = np.asarray(array)
+    n_points = array.shape[-1]
+    n_full = n_points // factor * factor
+    binned = array[..., :n_full].reshape(array.shape[:-1] + (-1, factor)).mean(axis=-1, dtype=np.float64)
+    if n_full < n_points:
+        binned = np.concatenate([binned, array[..., n_full:].mean(axis=-1, keepdims=True, dtype=np.float64)], axis=-1)
+    return binned
+
+
+def cross_correlate(array, template, lags):
+    """
+    Cross-correlate each row of `array` with `template` at the specified integer lags using FFT
+
+    Parameters
+    ----------
+    array : np.ndarray
+        2D array of intensities (M x N)
+    template : np.ndarray
+        1D array of the template signal (N)
+    lags : np.ndarray
+        1D array of integer lags (K)
+
+    Returns
+    -------
+    correlation : np.ndarray
+        2D array (M x K) where `correlation[i, k] = sum(template[n] * array[i, n + lags[k]])`
+    """
+    from scipy import fft
+
+    lags = np.asarray(lags)
+    n_points = array.shape[1]
+    # zero-pad the signals so that the correlation does not wrap around
+    n_fft = fft.next_fast_len(n_points + int(np.abs(lags).max()), real=True)
+    correlation = fft.irfft(
+        fft.rfft(array, n_fft, axis=1) * np.conj(fft.rfft(template, n_fft)), n_fft, axis=1, overwrite_x=True
+    )
+    return correlation[:, lags % n_fft]
+
+
+class LRUCache:
+    """Thread-safe cache that keeps a bounded number of the most recently used items
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of items in the cache
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Get item from the cache or `None` if it is not present"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Add item to the cache and remove the least recently used items if the cache is full"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getstate__(self):
+        # the cached items are not pickled
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"])
+
+
+class Workspace:
+    """Scratch buffers that are reused between calls to avoid allocating temporary arrays
+
+    Each thread has its own set of buffers. A buffer is only reallocated when a larger array (or different type) is
+    requested, otherwise a view of the existing buffer is returned, so the memory is bounded by the largest request.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def _buffers(self) -> dict:
+        """Buffers of the current thread"""
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        return buffers
+
+    def get(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        """Get uninitialized array of the specified shape and type that is backed by the buffer `name`"""
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = self._buffers[name] = np.empty(size, dtype=dtype)
+        return buffer[:size].reshape(shape)
+
+    @property
+    def nbytes(self) -> int:
+        """Size (in bytes) of the buffers of the current thread"""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def clear(self):
+        """Release the buffers of the current thread"""
+        self._buffers.clear()
+
+    def __getstate__(self):
+        # the buffers are not pickled
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+
 def find_nearest_index(x: np.ndarray, value: Union[float, int]):
     """Find index of nearest value
 
@@ -0,0 +1,83 @@
+"""Test scikit-learn style estimator"""
+import pickle
+
+import numpy as np
+import pytest
+from scipy import signal
+
+import msalign
+from msalign import AlignmentEstimator
+from msalign.utilities import shift
+
+
+@pytest.fixture
+def make_data():
+    def _wrap(n_signals=5):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i - 2) + np.random.normal(0, 1e-3, n_points)
+        return x, array, [gaussian_1.argmax(), gaussian_2.argmax()]
+
+    return _wrap
+
+
+class TestAlignmentEstimator:
+    """Test AlignmentEstimator"""
+
+    @staticmethod
+    @pytest.mark.parametrize("only_shift", (True, False))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_fit_transform(make_data, method, only_shift):
+        x, array, peaks = make_data()
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift)
+        aligner.run()
+        expected = aligner.apply()
+        estimator = AlignmentEstimator(x, peaks, method=method, only_shift=only_shift)
+        assert estimator.fit(array) is estimator
+        np.testing.assert_array_equal(estimator.shift_opt_, aligner.shift_opt.ravel())
+        np.testing.assert_array_equal(estimator.scale_opt_, aligner.scale_opt.ravel())
+        np.testing.assert_array_equal(estimator.transform(array), expected)
+        np.testing.assert_array_equal(estimator.fit_transform(array), expected)
+
+        out = np.zeros_like(array)
+        assert estimator.transform(array, out=out) is out
+        np.testing.assert_array_equal(out, expected)
+
+    @staticmethod
+    def test_pickle(make_data):
+        x, array, peaks = make_data(100)
+        estimator = AlignmentEstimator(x, peaks, method="linear").fit(array)
+        data = pickle.dumps(estimator)
+        # the signals are not stored in the estimator
+        assert len(data) < array.nbytes
+        other = pickle.loads(data)
+        np.testing.assert_array_equal(other.transform(array), estimator.transform(array))
+
+    @staticmethod
+    def test_params(make_data):
+        x, array, peaks = make_data()
+        estimator = AlignmentEstimator(x, peaks, method="linear")
+        params = estimator.get_params()
+        assert params["method"] == "linear"
+        assert params["peaks"] is peaks
+        assert estimator.set_params(method="pchip", iterations=3) is estimator
+        assert estimator.method == "pchip"
+        # estimator can be re-created from its parameters
+        other = AlignmentEstimator(**estimator.get_params())
+        assert other.get_params() == estimator.get_params()
+        with pytest.raises(ValueError):
+            estimator.set_params(n_signals=10)
+
+    @staticmethod
+    def test_transform_invalid(make_data):
+        x, array, peaks = make_data()
+        estimator = AlignmentEstimator(x, peaks, method="linear")
+        with pytest.raises(ValueError):
+            estimator.transform(array)
+        estimator.fit(array)
+        with pytest.raises(ValueError):
+            estimator.transform(array[:3])
@@ -0,0 +1,134 @@
+"""Test compiled kernels"""
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+import msalign
+from msalign import Aligner
+from msalign.kernels import _score_linear
+
+
+def _make_grid(n_signals: int = 3, n_grid: int = 7):
+    rng = np.random.default_rng(42)
+    x = np.sort(rng.uniform(0, 100, 200))
+    array = rng.uniform(0, 1, (n_signals, x.shape[0]))
+    scale_grid = rng.uniform(0.9, 1.1, (n_signals, n_grid))
+    shift_grid = rng.uniform(-20, 20, (n_signals, n_grid))
+    # points extend beyond the range of `x` and are not sorted
+    corr_sig_x = np.r_[np.linspace(-10, 60, 40), np.linspace(30, 110, 40)]
+    corr_sig_y = rng.uniform(0, 1, corr_sig_x.shape[0])
+    return x, array, scale_grid, shift_grid, corr_sig_x, corr_sig_y
+
+
+def _score_reference(x, array, scale_grid, shift_grid, corr_sig_x, corr_sig_y):
+    points = scale_grid[:, :, np.newaxis] * corr_sig_x + shift_grid[:, :, np.newaxis]
+    return np.stack(
+        [(np.interp(points[i], x, y, left=0, right=0) * corr_sig_y).sum(axis=-1) for i, y in enumerate(array)]
+    )
+
+
+def _make_signals():
+    n_points = 501
+    x = np.linspace(0, 250, n_points)
+    array = np.stack(
+        [
+            np.exp(-np.square((x - 80 * scale - n_shift) / 4)) + np.exp(-np.square((x - 170 * scale - n_shift) / 4))
+            for n_shift, scale in zip(range(-5, 5), np.linspace(0.99, 1.01, 10))
+        ]
+    )
+    return x, array, [80, 170]
+
+
+class TestKernels:
+    """Test kernels"""
+
+    @staticmethod
+    def test_score_linear_python():
+        """The (uncompiled) kernel gives the same result as `np.interp`"""
+        args = _make_grid()
+        scores = np.empty(args[2].shape)
+        _score_linear(*args, scores)
+        assert_allclose(scores, _score_reference(*args))
+
+    @staticmethod
+    def test_score_linear():
+        pytest.importorskip("numba")
+        from msalign.kernels import score_linear
+
+        args = _make_grid()
+        assert_allclose(score_linear(*args), _score_reference(*args))
+        # single precision signals
+        x, array, *args = args
+        assert_allclose(score_linear(x, array.astype(np.float32), *args), _score_reference(x, array, *args), rtol=1e-5)
+
+    @staticmethod
+    @pytest.mark.parametrize("optimizer", ("grid", "nelder-mead"))
+    @pytest.mark.parametrize("compute_dtype", ("float32", "float64"))
+    @pytest.mark.parametrize("pyramid_levels", (0, 2))
+    def test_kernels_identical(optimizer, compute_dtype, pyramid_levels):
+        pytest.importorskip("numba")
+        x, array, peaks = _make_signals()
+        results = []
+        for kernel in ("sparse", "numba"):
+            aligner = Aligner(
+                x,
+                array,
+                peaks,
+                method="linear",
+                width=4,
+                shift_range=[-10, 10],
+                optimizer=optimizer,
+                compute_dtype=compute_dtype,
+                pyramid_levels=pyramid_levels,
+                kernel=kernel,
+            )
+            assert aligner._use_kernel == (kernel == "numba")
+            aligner.run()
+            results.append((aligner.shift_opt, aligner.scale_opt))
+        if compute_dtype == "float64":
+            assert_array_equal(results[0][0], results[1][0])
+            assert_array_equal(results[0][1], results[1][1])
+        else:
+            # the kernel accumulates the scores in double precision so near-ties can be resolved differently
+            assert_allclose(results[0][0], results[1][0], atol=1e-2)
+            assert_allclose(results[0][1], results[1][1], atol=1e-4)
+
+    @staticmethod
+    def test_kernel_thread_backend():
+        pytest.importorskip("numba")
+        x, array, peaks = _make_signals()
+        expected = msalign.msalign(x, array, peaks, method="linear", width=4, kernel="sparse")
+        aligner = Aligner(x, array, peaks, method="linear", width=4, n_jobs=2, backend="thread", kernel="numba")
+        aligner.run()
+        assert_array_equal(aligner.apply(), expected)
+
+    @staticmethod
+    def test_kernel_auto(monkeypatch):
+        x, array, peaks = _make_signals()
+        aligner = Aligner(x, array, peaks, method="linear")
+        assert aligner.kernel == "auto"
+        assert aligner._use_kernel == msalign.align.NUMBA_AVAILABLE
+        # other methods always use the interpolators
+        aligner.method = "cubic"
+        assert not aligner._use_kernel
+
+        # without numba, the 'auto' kernel falls back to the sparse operators
+        monkeypatch.setattr(msalign.align, "NUMBA_AVAILABLE", False)
+        aligner = Aligner(x, array, peaks, method="linear")
+        assert not aligner._use_kernel
+        with pytest.raises(ImportError):
+            Aligner(x, array, peaks, method="linear", kernel="numba")
+
+    @staticmethod
+    def test_kernel_invalid():
+        x, array, peaks = _make_signals()
+        with pytest.raises(ValueError):
+            Aligner(x, array, peaks, kernel="cython")
+
+    @staticmethod
+    def test_sparse_operator_shared_window():
+        """Without numba, the sparse operator is only used for the shared window of the first level"""
+        x, array, peaks = _make_signals()
+        aligner = Aligner(x, array, peaks, method="linear", width=4, shift_range=[-10, 10], kernel="sparse")
+        aligner.run()
+        assert len(aligner._operators) == 1
@@ -1,6 +1,11 @@
 """Test functions"""
+import logging
+import subprocess
+import sys
+
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose, assert_equal
 from scipy import signal
 from scipy.ndimage import shift
 
@@ -19,6 +24,13 @@ def make_data():
     return _wrap
 
 
+def test_import_is_lazy():
+    """Check that importing the package does not import scipy which is loaded on first use"""
+    code = "import sys, msalign; print(sorted(name for name in sys.modules if name.split('.')[0] == 'scipy'))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
 class TestMSalign:
     """Test msalign"""
 
@@ -110,7 +122,7 @@ class TestMSalign:
 
     @pytest.mark.parametrize("noise", (0, 1e-5, 1e-3))
     @pytest.mark.parametrize("align_by_index", (True, False))
-    @pytest.mark.parametrize("method", ("pchip", "cubic"))
+    @pytest.mark.parametrize("method", ("pchip", "cubic", "linear"))
     @pytest.mark.parametrize("n_shift", (1, 3, 5, 7))
     def test_msalign_run(self, noise, align_by_index, method, n_shift):
         n_points = 100
@@ -213,3 +225,808 @@ class TestMSalign:
 
         np.testing.assert_array_almost_equal(shifts, aligner.shift_opt.flatten())
         np.testing.assert_array_almost_equal(scales, aligner.scale_opt.flatten())
+
+    @pytest.mark.parametrize("method", ("pchip", "cubic", "linear"))
+    @pytest.mark.parametrize("memory_limit", (1, None))
+    def test_aligner_compute_batch(self, method, memory_limit):
+        n_points = 200
+        n_signals = 7
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+
+        aligner = msalign.Aligner(
+            x, array, [gaussian_1.argmax(), gaussian_2.argmax()], method=method, memory_limit=memory_limit
+        )
+        if memory_limit == 1:
+            assert aligner.chunk_size == 1
+        shifts, scales = aligner.compute_batch(array)
+        assert shifts.shape == scales.shape == (n_signals,)
+        for i, y in enumerate(array):
+            shift_value, scale_value = aligner.compute(y)
+            assert shift_value == shifts[i]
+            assert scale_value == scales[i]
+
+    @pytest.mark.parametrize("method", ("pchip", "cubic"))
+    def test_aligner_workspace(self, method):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        gaussian = gaussian + shift(gaussian, 50) * 0.5
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-3, 3)])
+        peaks = [100, 150]
+        expected = msalign.Aligner(x, array, peaks, method=method)
+        expected.run()
+
+        # the grid is evaluated in blocks of cells that fit the memory limit
+        memory_limit = 10 * expected._corr_sig_l * 24
+        aligner = msalign.Aligner(x, array, peaks, method=method, memory_limit=memory_limit)
+        assert aligner._get_block_size(aligner._corr_sig_l, np.float64) == 10
+        aligner.run()
+        np.testing.assert_array_equal(aligner.shift_opt, expected.shift_opt)
+        np.testing.assert_array_equal(aligner.scale_opt, expected.scale_opt)
+        assert 0 < aligner._workspace.nbytes <= memory_limit
+
+        # buffers are reused by subsequent calls
+        buffers = dict(aligner._workspace._buffers)
+        aligner.run()
+        assert all(aligner._workspace._buffers[name] is buffer for name, buffer in buffers.items())
+
+    @pytest.mark.parametrize("memory_limit", (None, 20_000))
+    @pytest.mark.parametrize("method", ("pchip", "cubic", "zero"))
+    def test_aligner_score_shared(self, method, memory_limit):
+        n_points = 201
+        x = np.arange(n_points, dtype=np.float64)
+        gaussian = signal.gaussian(n_points, std=4)
+        gaussian = gaussian + shift(gaussian, 50) * 0.5
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-3, 3)])
+        aligner = msalign.Aligner(x, array, [100, 150], method=method, memory_limit=memory_limit)
+        scale_grid = 1 + 0.02 * aligner._search_space[:, 0]
+        shift_grid = -5 + 10 * aligner._search_space[:, 1]
+        corr_sig_x, corr_sig_y = aligner._corr_sig_x, aligner._corr_sig_y
+
+        # signals that are interpolated together have the same scores as the signals interpolated one at a time
+        scores = aligner._score_shared(array, x, True, None, scale_grid, shift_grid, corr_sig_x, corr_sig_y)
+        funcs = [msalign.utilities.generate_function(method, x, y, assume_sorted=True) for y in array]
+        expected = aligner._score_interpolators(
+            funcs, np.tile(scale_grid, (6, 1)), np.tile(shift_grid, (6, 1)), corr_sig_x, corr_sig_y
+        )
+        np.testing.assert_array_equal(scores, expected)
+
+    @pytest.mark.parametrize(
+        "method, kernel", (("pchip", "auto"), ("cubic", "auto"), ("linear", "numba"), ("linear", "sparse"))
+    )
+    def test_aligner_chunk_size_memory(self, method, kernel):
+        import tracemalloc
+
+        if kernel == "numba":
+            pytest.importorskip("numba")
+        n_points = 2001
+        x = np.linspace(0, 1000, n_points)
+        gaussian = signal.gaussian(n_points, std=8)
+        array = np.stack([shift(gaussian, n_shift) + shift(gaussian, n_shift - 300) for n_shift in range(-10, 10)] * 10)
+        memory_limit = 4 * 1024 * 1024
+        aligner = msalign.Aligner(
+            x, array, [500, 350], method=method, kernel=kernel, memory_limit=memory_limit, memory_mode="compute"
+        )
+        # the interpolated grid of each signal is not created so many more signals fit the memory limit
+        assert aligner.chunk_size > memory_limit // (3 * aligner.grid_steps**2 * aligner._corr_sig_l * 8)
+        # compile the kernel (and create the buffers) before the memory is traced
+        aligner.compute_batch(array[:1])
+        tracemalloc.start()
+        try:
+            aligner.compute_batch(array[: aligner.chunk_size])
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak <= memory_limit
+
+    @pytest.mark.parametrize("memory_limit", (0, -100))
+    def test_aligner_invalid_memory_limit(self, make_data, memory_limit):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], memory_limit=memory_limit)
+
+    @pytest.mark.parametrize("backend", ("process", "thread"))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_n_jobs(self, method, only_shift, backend):
+        n_points = 200
+        n_signals = 9
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligned = msalign.msalign(x, array, peaks, method=method, only_shift=only_shift)
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, n_jobs=2, backend=backend)
+        aligner.run()
+        np.testing.assert_array_equal(aligned, aligner.apply())
+
+    def test_msalign_backend_memory_limit(self):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-3, 3)])
+        expected = msalign.msalign(x, array, [100], method="linear")
+        aligned = msalign.msalign(x, array, [100], method="linear", memory_limit=1, n_jobs=2, backend="thread")
+        np.testing.assert_array_equal(aligned, expected)
+
+    def test_aligner_invalid_backend(self, make_data):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], backend="cluster")
+
+    @pytest.mark.parametrize("n_jobs", (0, 1.5))
+    def test_aligner_invalid_n_jobs(self, make_data, n_jobs):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], n_jobs=n_jobs)
+
+    @pytest.mark.parametrize("n_jobs", (np.int64(2), np.int32(-1), np.uint8(1)))
+    def test_aligner_numpy_n_jobs(self, make_data, n_jobs):
+        x, array = make_data()
+        aligner = msalign.Aligner(x, array, [5], n_jobs=n_jobs)
+        assert type(aligner.n_jobs) is int and aligner.n_jobs >= 1
+
+    @pytest.mark.parametrize("window", (None, 1, 3))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    def test_aligner_align_iter(self, window, only_shift):
+        n_points = 200
+        n_signals = 7
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        reference = msalign.Aligner(x, array, peaks, only_shift=only_shift)
+        reference.run()
+        aligned_array = reference.apply()
+
+        # signals are provided by a generator so the full array is never created
+        aligner = msalign.Aligner(x, None, peaks, only_shift=only_shift)
+        results = list(aligner.align_iter((y for y in array), window=window))
+        assert len(results) == n_signals
+        for i, (y, shift_value, scale_value) in enumerate(results):
+            np.testing.assert_array_equal(y, aligned_array[i])
+            assert shift_value == reference.shift_opt[i, 0]
+            assert scale_value == reference.scale_opt[i, 0]
+
+    @pytest.mark.parametrize("window", (0, -1))
+    def test_aligner_align_iter_invalid_window(self, make_data, window):
+        x, array = make_data()
+        aligner = msalign.Aligner(x, array, [5])
+        with pytest.raises(ValueError):
+            list(aligner.align_iter(array, window=window))
+
+    @pytest.mark.parametrize("n_jobs", (None, 2))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    def test_aligner_memmap(self, tmp_path, n_jobs, only_shift):
+        n_points = 200
+        n_signals = 7
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.lib.format.open_memmap(tmp_path / "array.npy", mode="w+", shape=(n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        array.flush()
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+        aligned = msalign.msalign(x, np.array(array), peaks, only_shift=only_shift)
+
+        array = np.load(tmp_path / "array.npy", mmap_mode="r")
+        out = np.lib.format.open_memmap(tmp_path / "aligned.npy", mode="w+", shape=array.shape)
+        aligner = msalign.Aligner(x, array, peaks, only_shift=only_shift, n_jobs=n_jobs, out=out)
+        assert aligner.array is array
+        aligner.run()
+        assert aligner.apply() is out
+        out.flush()
+        np.testing.assert_array_equal(aligned, np.load(tmp_path / "aligned.npy"))
+
+    def test_aligner_invalid_out(self, make_data):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], out=np.zeros((3, 3)))
+        aligner = msalign.Aligner(x, array, [5])
+        with pytest.raises(ValueError):
+            aligner.apply(out=np.zeros((3, 3)))
+
+    @pytest.mark.parametrize("n_jobs", (None, 2))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    def test_aligner_memory_mode(self, n_jobs, only_shift):
+        n_points = 200
+        n_signals = 7
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+        aligner = msalign.Aligner(x, array, peaks, only_shift=only_shift, n_jobs=n_jobs)
+        aligner.run()
+        aligned = aligner.apply()
+
+        # compute-only mode does not create the output array
+        aligner = msalign.Aligner(x, array, peaks, only_shift=only_shift, n_jobs=n_jobs, memory_mode="compute")
+        assert aligner.array_aligned is None
+        aligner.run()
+        with pytest.raises(ValueError):
+            aligner.apply()
+
+        # in-place mode overwrites the input array
+        array_inplace = array.copy()
+        aligner = msalign.Aligner(x, array_inplace, peaks, only_shift=only_shift, n_jobs=n_jobs, memory_mode="inplace")
+        aligner.run()
+        assert aligner.apply() is array_inplace
+        np.testing.assert_array_equal(aligned, array_inplace)
+
+    @pytest.mark.parametrize("memory_mode, n_blocks", (("inplace", 1), ("copy", 2)))
+    def test_aligner_process_shared_blocks(self, monkeypatch, memory_mode, n_blocks):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        gaussian = gaussian + shift(gaussian, 50) * 0.5
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-3, 3)])
+        reference = msalign.Aligner(x, array, [100, 150])
+        reference.run()
+        expected = reference.apply()
+
+        # count the shared memory blocks of the size of the signals - in-place alignment only needs one
+        blocks = []
+
+        class _SharedArray(msalign.parallel.SharedArray):
+            def __init__(self, shape, dtype, name=None):
+                super().__init__(shape, dtype, name)
+                if name is None and tuple(shape) == array.shape:
+                    blocks.append(shape)
+
+        monkeypatch.setattr(msalign.parallel, "SharedArray", _SharedArray)
+        array_inplace = array.copy()
+        aligner = msalign.Aligner(x, array_inplace, [100, 150], n_jobs=2, backend="process", memory_mode=memory_mode)
+        aligner.shift_opt[:], aligner.scale_opt[:] = reference.shift_opt, reference.scale_opt
+        aligner._computed = True
+        np.testing.assert_array_equal(aligner.apply(), expected)
+        assert len(blocks) == n_blocks
+
+    @pytest.mark.parametrize(
+        "memory_mode, out", (("external", None), ("copy", np.zeros((20, 10))), ("inplace", np.zeros((20, 10))))
+    )
+    def test_aligner_invalid_memory_mode(self, make_data, memory_mode, out):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], memory_mode=memory_mode, out=out)
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], memory_mode="temporary")
+
+    @pytest.mark.parametrize("method", ("pchip", "zero", "slinear", "quadratic", "cubic"))
+    def test_aligner_support(self, method):
+        n_points = 2000
+        n_signals = 5
+        x = np.arange(n_points)
+        gaussian_1 = shift(signal.gaussian(n_points, std=4), -500)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        # interpolators are only built around the reference peaks
+        aligner = msalign.Aligner(x, array, peaks, method=method, shift_range=[-20, 20])
+        assert aligner._support is not None
+        assert aligner._support.shape[0] < n_points / 2
+        shifts, scales = aligner.compute_batch(array)
+
+        aligner._support = None
+        shifts_full, scales_full = aligner.compute_batch(array)
+        np.testing.assert_array_almost_equal(shifts, shifts_full)
+        np.testing.assert_array_almost_equal(scales, scales_full)
+
+    @pytest.mark.parametrize("n_shift", (-30, -7, 0, 3, 45))
+    def test_aligner_optimizer_fft(self, n_shift):
+        n_points = 501
+        n_signals = 6
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 100) * 0.5
+        gaussian = gaussian_1 + gaussian_2
+        shifts = np.arange(n_signals) + n_shift
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian, int(shifts[i])) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, only_shift=True, optimizer="fft", width=4, ratio=2)
+        aligner.run()
+        np.testing.assert_array_equal(np.round(aligner.shift_opt.ravel()), shifts)
+        np.testing.assert_array_equal(aligner.scale_opt, 1)
+        for y in aligner.apply():
+            assert y.argmax() == gaussian_1.argmax()
+
+    def test_aligner_invalid_optimizer(self, make_data):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], optimizer="random")
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [2, 5], optimizer="fft", only_shift=False)
+
+    @pytest.mark.parametrize("only_shift", (True, False))
+    @pytest.mark.parametrize("optimizer", ("nelder-mead", "brent", "pattern"))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_optimizer_local(self, method, optimizer, only_shift):
+        n_points = 501
+        n_signals = 5
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 100) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, 3 * i - 5) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        grid = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, width=4)
+        grid.run()
+        np.testing.assert_array_equal(grid.n_evaluations, grid.n_iterations * grid.grid_steps**2)
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, width=4, optimizer=optimizer)
+        aligner.run()
+        # shift and scale are correlated so compare the position of the aligned peaks instead
+        np.testing.assert_allclose(aligner.apply().argmax(axis=1), grid.apply().argmax(axis=1), atol=1)
+        assert np.all(aligner.n_evaluations > 0)
+        assert np.all(aligner.n_evaluations < grid.n_evaluations)
+
+    @pytest.mark.parametrize("optimizer", ("nelder-mead", "brent", "pattern"))
+    def test_aligner_optimizer_local_wide_range(self, optimizer):
+        n_points = 2001
+        x = np.arange(n_points, dtype=np.float64)
+        peaks = [400, 700, 1000, 1300, 1600]
+        rng = np.random.default_rng(0)
+        signals = []
+        for _ in range(20):
+            scale, n_shift = rng.uniform(0.95, 1.05), rng.uniform(-100, 100)
+            signals.append(
+                sum(
+                    height * np.exp(-np.square((x - (peak * scale + n_shift)) / 3))
+                    for peak, height in zip(peaks, (1, 0.6, 0.8, 0.5, 0.9))
+                )
+                + rng.normal(0, 1e-3, n_points)
+            )
+        array = np.stack(signals)
+
+        # narrow peaks and wide shift range - the window that is refined contains many local optima
+        grid = msalign.Aligner(x, array, peaks, method="cubic", width=3, shift_range=[-150, 150])
+        grid.run()
+        aligner = msalign.Aligner(
+            x, array, peaks, method="cubic", width=3, shift_range=[-150, 150], optimizer=optimizer
+        )
+        aligner.run()
+        # the refined solution stays in the basin of the grid search and never scores worse than its start
+        np.testing.assert_allclose(aligner.apply().argmax(axis=1), grid.apply().argmax(axis=1), atol=1)
+        assert np.all(aligner._info["score"] >= 0.99 * grid._info["score"])
+
+    @pytest.mark.parametrize("n_jobs", (1, 2))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_tolerance(self, method, n_jobs):
+        n_points = 200
+        n_signals = 6
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, i) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, method=method, iterations=8, n_jobs=n_jobs)
+        aligner.run()
+        np.testing.assert_array_equal(aligner.n_iterations_used, 8)
+        shift_opt = aligner.shift_opt.copy()
+
+        # large tolerance stops the refinement right after the second iteration
+        aligner.xtol, aligner.stol = 1000, 1
+        aligner.run()
+        np.testing.assert_array_equal(aligner.n_iterations_used, 2)
+        np.testing.assert_array_equal(aligner.n_evaluations, 2 * aligner.grid_steps**2)
+
+        aligner.xtol, aligner.stol = 0.1, 1e-3
+        aligner.run()
+        assert np.all(aligner.n_iterations_used >= 2)
+        assert np.all(aligner.n_iterations_used < 8)
+        np.testing.assert_allclose(aligner.shift_opt, shift_opt, atol=0.5)
+
+    @pytest.mark.parametrize("tolerance", ("xtol", "stol", "gain_tol"))
+    def test_aligner_invalid_tolerance(self, make_data, tolerance):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], **{tolerance: -1})
+
+    @pytest.mark.parametrize("n_jobs", (1, 2))
+    @pytest.mark.parametrize("warm_start", (True, 3))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_warm_start(self, method, warm_start, n_jobs):
+        n_points = 201
+        n_signals = 20
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        shifts = np.arange(n_signals) // 4
+        # single signal which is very different from its neighbours should fall back to the full search range
+        shifts[10] = -40
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, int(shifts[i])) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=True, n_jobs=n_jobs)
+        aligner.run()
+        n_evaluations = aligner.n_evaluations.sum()
+        np.testing.assert_array_equal(np.round(aligner.shift_opt.ravel()), shifts)
+        aligner.run(warm_start=warm_start)
+        np.testing.assert_array_equal(np.round(aligner.shift_opt.ravel()), shifts)
+        assert aligner.n_evaluations.sum() < n_evaluations
+
+    def test_aligner_warm_start_blocks(self, tmp_path):
+        import tracemalloc
+
+        n_points = 2001
+        n_signals = 83
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=4)
+        gaussian_2 = shift(gaussian_1, 50) * 0.5
+        shifts = np.arange(n_signals) // 10
+        shifts[30] = -40
+        array = np.lib.format.open_memmap(tmp_path / "array.npy", mode="w+", shape=(n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, int(shifts[i]))
+        array.flush()
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        # the solutions do not depend on the size of the blocks
+        aligner = msalign.Aligner(x, array, peaks, method="linear", memory_mode="compute")
+        expected = aligner._compute_warm_start(np.asarray(array), 8, block_size=n_signals)
+        for block_size in (1, 8, 20):
+            result = aligner._compute_warm_start(array, 8, block_size=block_size)
+            for values, expected_values in zip(result[:2], expected[:2]):
+                np.testing.assert_array_equal(values, expected_values)
+            np.testing.assert_array_equal(result[2]["n_evaluations"], expected[2]["n_evaluations"])
+
+        # only one block of the memory-mapped array is read into memory at a time
+        aligner = msalign.Aligner(x, array, peaks, method="linear", memory_mode="compute", memory_limit=1)
+        assert aligner.chunk_size == 1
+        tracemalloc.start()
+        try:
+            aligner.run(warm_start=True)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < array.nbytes / 4
+        np.testing.assert_array_equal(aligner.shift_opt[:, 0], expected[0].astype(np.float32))
+
+    @pytest.mark.parametrize("backend", ("thread", "process"))
+    def test_aligner_warm_start_n_jobs(self, backend):
+        n_points = 1001
+        n_signals = 61
+        x = np.linspace(0, 1000, n_points)
+        rng = np.random.default_rng(0)
+        # slowly drifting shift and scale so the seeds differ between neighbouring anchors
+        shifts = np.cumsum(rng.normal(0, 0.3, n_signals))
+        shifts[25] += 15
+        array = np.stack(
+            [
+                sum(np.exp(-np.square((x - peak * (1 + 1e-4 * i) - shifts[i]) / 4)) for peak in (200, 500, 800))
+                for i in range(n_signals)
+            ]
+        )
+        peaks = [200, 500, 800]
+        expected = msalign.Aligner(x, array, peaks, method="linear", width=4, memory_mode="compute")
+        expected.run(warm_start=True)
+
+        # signals can be computed in any range that starts at an anchor
+        shift_opt, scale_opt, info = expected._compute_warm_start(array, 8, start=16, stop=43)
+        np.testing.assert_array_equal(shift_opt.astype(expected.shift_opt.dtype), expected.shift_opt[16:43, 0])
+        np.testing.assert_array_equal(scale_opt.astype(expected.scale_opt.dtype), expected.scale_opt[16:43, 0])
+        np.testing.assert_array_equal(info["n_evaluations"], expected.n_evaluations[16:43])
+
+        # tasks start at the anchors so the results do not depend on the number of workers
+        for n_jobs in (2, 3):
+            aligner = msalign.Aligner(
+                x, array, peaks, method="linear", width=4, memory_mode="compute", n_jobs=n_jobs, backend=backend
+            )
+            aligner.run(warm_start=True)
+            np.testing.assert_array_equal(aligner.shift_opt, expected.shift_opt)
+            np.testing.assert_array_equal(aligner.scale_opt, expected.scale_opt)
+            np.testing.assert_array_equal(aligner.n_evaluations, expected.n_evaluations)
+
+    @pytest.mark.parametrize("warm_start", (1, -2, 2.5))
+    def test_aligner_invalid_warm_start(self, make_data, warm_start):
+        x, array = make_data()
+        aligner = msalign.Aligner(x, array, [5])
+        with pytest.raises(ValueError):
+            aligner.run(warm_start=warm_start)
+        aligner = msalign.Aligner(x, array, [5], optimizer="fft")
+        with pytest.raises(ValueError):
+            aligner.run(warm_start=True)
+
+    @pytest.mark.parametrize("proxy", ("peaks", "bin:2", "bin:3"))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_proxy(self, method, only_shift, proxy):
+        n_points = 1001
+        n_signals = 5
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=8)
+        gaussian_2 = shift(gaussian_1, 100) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, 2 * i - 4) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, width=8, shift_range=[-20, 20])
+        aligner.run()
+        expected = aligner.apply().copy()
+        proxy_aligner = msalign.Aligner(
+            x, array, peaks, method=method, only_shift=only_shift, width=8, shift_range=[-20, 20], proxy=proxy
+        )
+        assert proxy_aligner.proxy == proxy
+        proxy_aligner.run()
+        if proxy == "peaks":
+            # only the points that are never sampled are removed so the results are the same
+            np.testing.assert_allclose(proxy_aligner.shift_opt, aligner.shift_opt, atol=1e-5)
+            np.testing.assert_allclose(proxy_aligner.scale_opt, aligner.scale_opt, atol=1e-7)
+        # factors are applied to the full-resolution signals
+        result = proxy_aligner.apply()
+        assert result.shape == expected.shape
+        np.testing.assert_allclose(result.argmax(axis=1), expected.argmax(axis=1), atol=1)
+
+    @pytest.mark.parametrize("proxy", ("bin", "bin:1", "bin:a", "peaks:2", "random"))
+    def test_aligner_invalid_proxy(self, make_data, proxy):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], proxy=proxy)
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], proxy="bin:2", optimizer="fft")
+
+    @pytest.mark.parametrize("method, factor", (("linear", 100), ("pchip", 200), ("cubic", 40), ("quadratic", 50)))
+    def test_aligner_proxy_too_few_points(self, method, factor):
+        x = np.arange(100)
+        array = np.random.random((3, 100))
+        with pytest.raises(ValueError, match="proxy"):
+            msalign.Aligner(x, array, [50], method=method, proxy=f"bin:{factor}")
+        # the method is validated against the current proxy as well
+        aligner = msalign.Aligner(x, array, [50], method="linear", proxy="bin:40")
+        with pytest.raises(ValueError, match="proxy"):
+            aligner.method = "cubic"
+        assert aligner.method == "linear"
+
+    @pytest.mark.parametrize("proxy", (None, "peaks"))
+    @pytest.mark.parametrize("pyramid_levels", (1, 2, 5))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_pyramid(self, method, only_shift, pyramid_levels, proxy):
+        n_points = 1001
+        n_signals = 5
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=8)
+        gaussian_2 = shift(gaussian_1, 100) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, 3 * i - 6) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, width=8)
+        aligner.run()
+        expected = aligner.apply().copy()
+        pyramid = msalign.Aligner(
+            x, array, peaks, method=method, only_shift=only_shift, width=8, pyramid_levels=pyramid_levels, proxy=proxy
+        )
+        pyramid.run()
+        np.testing.assert_array_equal(pyramid.n_iterations_used, aligner.n_iterations)
+        np.testing.assert_allclose(pyramid.apply().argmax(axis=1), expected.argmax(axis=1), atol=1)
+
+    @pytest.mark.parametrize("pyramid_levels", (-1, 1.5))
+    def test_aligner_invalid_pyramid_levels(self, make_data, pyramid_levels):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], pyramid_levels=pyramid_levels)
+
+    @pytest.mark.parametrize("optimizer, only_shift", (("grid", True), ("grid", False), ("fft", True)))
+    @pytest.mark.parametrize("method", ("pchip", "linear"))
+    def test_aligner_compute_dtype(self, method, only_shift, optimizer):
+        n_points = 1001
+        n_signals = 5
+        x = np.arange(n_points)
+        gaussian_1 = signal.gaussian(n_points, std=8)
+        gaussian_2 = shift(gaussian_1, 100) * 0.5
+        array = np.zeros((n_signals, n_points))
+        for i in range(n_signals):
+            array[i] = shift(gaussian_1 + gaussian_2, 3 * i - 6) + np.random.normal(0, 1e-3, n_points)
+        peaks = [gaussian_1.argmax(), gaussian_2.argmax()]
+
+        aligner = msalign.Aligner(x, array, peaks, method=method, only_shift=only_shift, width=8, optimizer=optimizer)
+        aligner.run()
+        expected = aligner.apply().copy()
+        aligner_32 = msalign.Aligner(
+            x,
+            array,
+            peaks,
+            method=method,
+            only_shift=only_shift,
+            width=8,
+            optimizer=optimizer,
+            compute_dtype="float32",
+            output_dtype="float32",
+        )
+        assert aligner_32.compute_dtype == np.float32
+        assert aligner_32.chunk_size >= aligner.chunk_size
+        aligner_32.run()
+        result = aligner_32.apply()
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result.argmax(axis=1), expected.argmax(axis=1), atol=1)
+
+    @pytest.mark.parametrize("compute_dtype", ("float16", "int32", np.complex64, "random"))
+    def test_aligner_invalid_compute_dtype(self, make_data, compute_dtype):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], compute_dtype=compute_dtype)
+
+    @pytest.mark.parametrize("output_dtype", (None, "float16", "float32", "float64"))
+    @pytest.mark.parametrize("only_shift", (True, False))
+    def test_aligner_output_dtype(self, make_data, output_dtype, only_shift):
+        x, array = make_data()
+        aligner = msalign.Aligner(x, array, [5], only_shift=only_shift, output_dtype=output_dtype)
+        # integer signals are not truncated
+        expected = np.dtype(output_dtype or np.float64)
+        assert aligner.output_dtype == expected
+        aligner.run()
+        assert aligner.apply().dtype == expected
+        for y, _, _ in aligner.align_iter(array):
+            assert y.dtype == expected
+
+    def test_aligner_invalid_output_dtype(self, make_data):
+        x, array = make_data()
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], output_dtype="int32")
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], output_dtype="float32", memory_mode="inplace")
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [5], output_dtype="float32", out=np.zeros(array.shape))
+
+    def test_aligner_inplace_integer(self, make_data):
+        x, array = make_data()
+        # rescaled (interpolated) signals would be truncated when written back to integer array
+        with pytest.raises(ValueError):
+            msalign.Aligner(x, array, [2, 7], memory_mode="inplace")
+        # shifting is lossless
+        array_inplace = array.copy()
+        aligner = msalign.Aligner(x, array_inplace, [5], memory_mode="inplace")
+        aligner.run()
+        assert aligner.apply() is array_inplace
+
+    @pytest.mark.parametrize("n_jobs", (1, 2))
+    @pytest.mark.parametrize("optimizer, only_shift", (("grid", False), ("nelder-mead", False), ("fft", True)))
+    def test_aligner_stats(self, optimizer, only_shift, n_jobs):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-5, 5)])
+        aligner = msalign.Aligner(
+            x, array, [100], optimizer=optimizer, only_shift=only_shift, n_jobs=n_jobs, backend="thread"
+        )
+        stats = aligner.stats
+        assert stats["n_signals"] == 0
+        assert np.isnan(stats["time_per_signal"])
+
+        aligner.run()
+        aligner.apply()
+        stats = aligner.stats
+        assert stats["n_signals"] == aligner.n_signals
+        assert stats["n_evaluations"] == aligner.n_evaluations.sum()
+        assert (stats["n_points"] > 0) == (optimizer != "fft")
+        assert (stats["time_refine"] > 0) == (optimizer == "nelder-mead")
+        assert stats["time_objective"] > 0
+        assert stats["time_compute"] > 0 and stats["time_apply"] > 0
+        assert 0 < stats["time_per_signal"] * stats["n_signals"] <= stats["time_compute"] * aligner.n_jobs
+
+    def test_aligner_lazy_logging(self, monkeypatch, caplog):
+        def _time_loop(*args, **kwargs):
+            raise AssertionError("Timing information should not be formatted when debug logging is disabled")
+
+        monkeypatch.setattr(msalign.align, "time_loop", _time_loop)
+        caplog.set_level(logging.INFO, logger=msalign.align.LOGGER.name)
+        x = np.arange(101)
+        array = np.stack([signal.gaussian(101, std=4)] * 3)
+        aligner = msalign.Aligner(x, array, [50], only_shift=True)
+        aligner.run()
+        aligner.apply()
+
+    @pytest.mark.parametrize("n_jobs", (1, 2))
+    @pytest.mark.parametrize("only_shift", (False, True))
+    def test_aligner_progress(self, only_shift, n_jobs):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        gaussian = np.roll(gaussian, -40) + np.roll(gaussian, 40)
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-5, 5)])
+        aligner = msalign.Aligner(
+            x, array, [60, 140], only_shift=only_shift, align_by_index=only_shift, n_jobs=n_jobs, backend="thread"
+        )
+        reported = []
+        aligner.run(callback=reported.append, callback_every=3)
+        n_done = [progress.n_done for progress in reported]
+        # parallel tasks are balanced between the workers so they can be smaller than `callback_every`
+        assert n_done == [3, 6, 9, 10] if n_jobs == 1 else n_done == sorted(n_done) and n_done[-1] == 10
+        assert all(progress.stage == "run" and progress.n_total == 10 for progress in reported)
+        assert aligner.progress.n_done == 10 and not aligner.progress.cancelled
+        assert aligner._computed
+
+        reported = []
+        aligner.apply(callback=reported.append, callback_every=4)
+        assert reported[-1].n_done == 10
+        assert reported[-1].stage == ("shift" if only_shift else "align")
+        assert reported[-1].eta == 0
+
+    @pytest.mark.parametrize("n_jobs", (1, 2))
+    def test_aligner_progress_cancel(self, n_jobs):
+        n_points = 201
+        x = np.arange(n_points)
+        gaussian = signal.gaussian(n_points, std=4)
+        array = np.stack([shift(gaussian, n_shift) for n_shift in range(-5, 5)] * 4)
+        aligner = msalign.Aligner(x, array, [100], n_jobs=n_jobs, backend="thread")
+        aligner.run(callback=lambda progress: progress.n_done >= 2, callback_every=2)
+        n_done = aligner.progress.n_done
+        assert n_done < aligner.n_signals
+        assert aligner.progress.cancelled
+        assert not aligner._computed
+        assert_equal(aligner.shift_opt[n_done:, 0], 0)
+        assert aligner.stats["n_signals"] == n_done
+
+        # cancel from within the callback using the `cancel` method
+        aligner.run(callback=lambda progress: aligner.cancel(), callback_every=5)
+        assert aligner.progress.cancelled
+        assert aligner.progress.n_done < aligner.n_signals
+
+        # the flag is reset by the next operation
+        aligner.run()
+        assert aligner._computed and not aligner.progress.cancelled
+
+    @pytest.mark.parametrize("memory_mode", ("inplace", "external"))
+    def test_aligner_process_apply_cancel(self, memory_mode):
+        n_points = 201
+        x = np.arange(n_points, dtype=np.float64)
+        gaussian = signal.gaussian(n_points, std=4)
+        # two peaks so the signals are interpolated rather than shifted
+        array = np.stack([shift(gaussian, n_shift) + shift(gaussian, 2 * n_shift - 50) for n_shift in range(-10, 10)])
+        original = array.copy()
+        out = np.full_like(array, -1) if memory_mode == "external" else None
+        aligner = msalign.Aligner(x, array, [50, 100], n_jobs=2, backend="process", memory_mode=memory_mode, out=out)
+        aligner.run()
+        aligner.apply(callback=lambda progress: True, callback_every=2)
+        n_done = aligner.progress.n_done
+        assert aligner.progress.cancelled
+        assert 0 < n_done < aligner.n_signals
+        # signals that were aligned before the cancellation are written and the remaining rows are left unchanged
+        expected = msalign.msalign(x, original, [50, 100])
+        assert_allclose(aligner.array_aligned[:n_done], expected[:n_done])
+        if memory_mode == "inplace":
+            assert aligner.array_aligned is array
+            assert_equal(array[n_done:], original[n_done:])
+        else:
+            assert aligner.array_aligned is out
+            assert_equal(out[n_done:], -1)
+            assert_equal(array, original)
+
+    @pytest.mark.parametrize("callback_every", (0, -1, 1.5))
+    def test_aligner_invalid_callback_every(self, callback_every):
+        x = np.arange(101)
+        array = np.stack([signal.gaussian(101, std=4)] * 3)
+        aligner = msalign.Aligner(x, array, [50])
+        with pytest.raises(ValueError):
+            aligner.run(callback_every=callback_every)
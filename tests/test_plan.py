@@ -0,0 +1,49 @@
+"""Test alignment plan"""
+import pickle
+
+import numpy as np
+import pytest
+
+from msalign import Aligner, AlignmentPlan
+from msalign.plan import get_plan
+
+
+class TestAlignmentPlan:
+    """Test AlignmentPlan"""
+
+    @staticmethod
+    def test_get_plan_cached():
+        plan = get_plan([10, 50], [1, 1], 10, 2.5, 100, 20, [-10, 10], False)
+        assert isinstance(plan, AlignmentPlan)
+        # equal parameters (regardless of their type) return the same plan
+        assert get_plan(np.array([10.0, 50.0]), (1.0, 1.0), 10.0, 2.5, 100, 20, (-10, 10), False) is plan
+        other = get_plan([10, 50], [1, 1], 10, 2.5, 100, 20, [-10, 10], True)
+        assert other is not plan
+        assert other != plan
+        assert hash(plan) != hash(other)
+        assert plan.search_space.shape == (400, 2)
+        assert plan.corr_sig_x.shape == plan.corr_sig_y.shape == (plan.corr_sig_l,)
+        np.testing.assert_array_equal(other.scale_range, [1, 1])
+
+    @staticmethod
+    def test_plan_immutable():
+        plan = get_plan([10, 50], [1, 1], 10, 2.5, 100, 20, [-10, 10], False)
+        with pytest.raises(AttributeError):
+            plan.grid_steps = 10
+        with pytest.raises(AttributeError):
+            plan.corr_sig_x = None
+        with pytest.raises(ValueError):
+            plan.search_space[0] = 1
+
+    @staticmethod
+    def test_plan_pickle():
+        plan = get_plan([10, 50], [1, 1], 10, 2.5, 100, 20, [-10, 10], False)
+        assert pickle.loads(pickle.dumps(plan)) is plan
+
+    @staticmethod
+    def test_aligner_plan():
+        x = np.arange(200)
+        array = np.random.uniform(0, 1, (3, 200))
+        aligner = Aligner(x, array, [50, 100], width=5)
+        assert Aligner(x, array[:1], [50, 100], width=5).plan is aligner.plan
+        assert Aligner(x, array, [50, 100], width=6).plan is not aligner.plan
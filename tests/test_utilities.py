@@ -1,16 +1,28 @@
 """Utilities."""
+import pickle
+import threading
+
 import numpy as np
 import pytest
 import scipy.interpolate as interpolate
 from numpy.testing import assert_array_equal, assert_equal
 
 from msalign.utilities import (
+    LinearInterpolator,
+    LRUCache,
+    Progress,
+    ProgressTracker,
+    Workspace,
+    bin_signal,
     check_xy,
     convert_peak_values_to_index,
+    cross_correlate,
     find_nearest_index,
     format_time,
     generate_function,
+    interpolation_operator,
     shift,
+    shift_rows,
 )
 
 
@@ -45,6 +57,35 @@ class TestShift:
         assert y_new[-1] == fill_value
 
 
+class TestShiftRows:
+    """Test shift_rows"""
+
+    @staticmethod
+    @pytest.mark.parametrize("fill_value", (0, 100))
+    def test_shift_rows(fill_value):
+        array = np.random.randint(0, 100, (7, 10))
+        nums = np.array([-3, -1, 0, 0, 2, 2, 10])
+        result = shift_rows(array, nums, fill_value)
+        for y, y_new, num in zip(array, result, nums):
+            assert_array_equal(y_new, shift(y, int(num), fill_value))
+
+    @staticmethod
+    def test_shift_rows_inplace():
+        array = np.random.randint(0, 100, (7, 10))
+        nums = np.array([-3, -3, -1, 0, 2, 5, 10])
+        expected = shift_rows(array, nums)
+        result = shift_rows(array, nums, out=array)
+        assert result is array
+        assert_array_equal(result, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize("nums", ([1.0, 2.0], [1, 2, 3]))
+    def test_shift_rows_fail(nums):
+        array = np.random.randint(0, 100, (2, 10))
+        with pytest.raises(ValueError):
+            shift_rows(array, nums)
+
+
 class TestFindNearestIndex:
     """Test find_nearest_index"""
 
@@ -84,6 +125,107 @@ class TestGenerateInterpolationFunction:
         fcn = generate_function("zero", [1, 2, 3], [3, 2, 1])
         assert isinstance(fcn, interpolate.interp1d)
 
+    @staticmethod
+    @pytest.mark.parametrize("engine, expected", (("auto", LinearInterpolator), ("scipy", interpolate.interp1d)))
+    def test_generate_function_linear(engine, expected):
+        """Test linear function generator"""
+        fcn = generate_function("linear", [1, 2, 3], [3, 2, 1], engine=engine)
+        assert isinstance(fcn, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize("method, engine", (("linear", "native"), ("cubic", "numpy")))
+    def test_generate_function_invalid_engine(method, engine):
+        """Test that invalid engine raises an error"""
+        with pytest.raises(ValueError):
+            generate_function(method, [1, 2, 3], [3, 2, 1], engine=engine)
+
+    @staticmethod
+    @pytest.mark.parametrize("assume_sorted", (True, False))
+    @pytest.mark.parametrize("dtype", (np.float64, np.int64))
+    def test_linear_interpolator(assume_sorted, dtype):
+        """Test that the native linear interpolator matches scipy"""
+        x = np.sort(np.random.uniform(0, 100, 50))
+        y = np.random.uniform(0, 100, 50).astype(dtype)
+        if not assume_sorted:
+            index = np.random.permutation(50)
+            x, y = x[index], y[index]
+        x_new = np.random.uniform(-10, 110, 500)
+        x_new[:3] = x.min(), x.max(), x[10]
+        expected = interpolate.interp1d(x, y, "linear", bounds_error=False, fill_value=0)(x_new)
+        result = LinearInterpolator(x, y, assume_sorted=assume_sorted)(x_new)
+        assert_array_equal(result, expected)
+
+
+class TestInterpolationOperator:
+    """Test interpolation_operator"""
+
+    @staticmethod
+    def test_interpolation_operator():
+        """Test that the operator matches linear interpolation"""
+        x = np.sort(np.random.uniform(0, 100, 50))
+        array = np.random.uniform(0, 100, (5, 50))
+        points = np.random.uniform(-10, 110, (20, 30))
+        points[0, :3] = x[0], x[-1], x[10]
+        weights = np.random.uniform(0, 1, 30)
+        operator = interpolation_operator(x, points, weights)
+        assert operator.shape == (20, 50)
+        for y, result in zip(array, (operator @ array.T).T):
+            expected = (np.interp(points, x, y, left=0, right=0) * weights).sum(axis=1)
+            np.testing.assert_allclose(result, expected)
+
+
+class TestBinSignal:
+    """Test bin_signal"""
+
+    @staticmethod
+    def test_bin_signal():
+        array = np.arange(14, dtype=np.float32).reshape(2, 7)
+        result = bin_signal(array, 3)
+        assert result.dtype == np.float64
+        np.testing.assert_array_equal(result, [[1, 4, 6], [8, 11, 13]])
+        np.testing.assert_array_equal(bin_signal(np.arange(6), 2), [0.5, 2.5, 4.5])
+
+
+class TestCrossCorrelate:
+    """Test cross_correlate"""
+
+    @staticmethod
+    def test_cross_correlate():
+        """Test that the FFT correlation matches direct computation"""
+        array = np.random.uniform(0, 1, (4, 60))
+        template = np.random.uniform(0, 1, 60)
+        lags = np.arange(-15, 16)
+        result = cross_correlate(array, template, lags)
+        assert result.shape == (4, lags.size)
+        for y, values in zip(array, result):
+            expected = [np.sum(template * shift(y, -int(lag))) for lag in lags]
+            np.testing.assert_allclose(values, expected)
+
+
+class TestLRUCache:
+    """Test LRUCache"""
+
+    @staticmethod
+    def test_lru_cache():
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    @staticmethod
+    def test_lru_cache_pickle():
+        import pickle
+
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache = pickle.loads(pickle.dumps(cache))
+        assert cache.maxsize == 2
+        assert len(cache) == 0
+
 
 class TestCheckXY:
     """Test check_xy"""
@@ -122,3 +264,50 @@ def test_format_time(value, expected):
     """Test 'format_time'"""
     result = format_time(value)
     assert expected in result
+
+
+def test_progress_tracker():
+    """Test 'ProgressTracker'"""
+    reported = []
+    tracker = ProgressTracker("run", 10, reported.append, every=4)
+    assert not any(tracker.update(n_done) for n_done in range(1, 11))
+    assert [progress.n_done for progress in reported] == [4, 8, 10]
+    progress = tracker.progress
+    assert isinstance(progress, Progress)
+    assert progress.eta == 0 and progress.throughput > 0
+    assert str(progress).startswith("run 10/10")
+
+    # cancelled by the callback or by the external flag
+    tracker = ProgressTracker("run", 10, lambda progress: progress.n_done >= 2)
+    assert not tracker.update(1)
+    assert tracker.update(2) and tracker.progress.cancelled
+    tracker = ProgressTracker("run", 10, is_cancelled=lambda: True)
+    assert tracker.update(1)
+
+
+def test_workspace():
+    """Test 'Workspace'"""
+    workspace = Workspace()
+    array = workspace.get("values", (4, 5), np.float64)
+    assert array.shape == (4, 5) and array.dtype == np.float64
+    assert workspace.nbytes == array.nbytes
+    # smaller arrays are backed by the same buffer
+    smaller = workspace.get("values", (2, 5), np.float64)
+    assert np.shares_memory(array, smaller)
+    assert workspace.nbytes == array.nbytes
+    # larger arrays and different types are reallocated
+    assert not np.shares_memory(array, workspace.get("values", (5, 5), np.float64))
+    assert workspace.get("values", (2, 5), np.float32).dtype == np.float32
+    assert workspace.nbytes == 10 * 4
+
+    # each thread has its own buffers
+    other = []
+    thread = threading.Thread(target=lambda: other.append(workspace.get("values", (2, 5), np.float32)))
+    thread.start()
+    thread.join()
+    assert not np.shares_memory(other[0], workspace.get("values", (2, 5), np.float32))
+
+    # buffers are not pickled
+    assert pickle.loads(pickle.dumps(workspace)).nbytes == 0
+    workspace.clear()
+    assert workspace.nbytes == 0